@@ -1,23 +1,55 @@
 import tkinter as tk
+from tkinter import filedialog, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 import numpy as np
+from Eduardo.bootstrap import bootstrap_support, load_characters
+from Eduardo.distances import load_distances
+from Eduardo.tree_metrics import classify_distances
+from Eduardo.trees import MergeTrace, TraceCursor, dendrogram_layout, neighbor_joining, to_square, upgma
+from jobs import JobExecutor
+
+MAX_SHOWN = 30  # Taxones máximos para dibujar la matriz en pantalla
+REPLICATES = 100  # Réplicas bootstrap del árbol consenso
+
+def _job_classify(job, distances, labels):
+    kind, witness = classify_distances(distances)
+    # El contraejemplo se muestra con las etiquetas de los taxones
+    return kind, witness and ", ".join(labels[i] for i in witness)
+
+def _job_bootstrap(job, characters, method, labels):
+    return bootstrap_support(characters, REPLICATES, method, labels=labels)
+
+def _job_tree(job, builder, distances, labels, matrix):
+    # El algoritmo corre una sola vez; los pasos solo reproducen su traza
+    trace = MergeTrace(record_rows=matrix is not None)
+    tree = builder(distances, labels=labels, trace=trace)
+    return tree, trace, None if matrix is None else TraceCursor(matrix, trace)
 
 class TreeVisualizer:
-    def __init__(self, root):
+    def __init__(self, root, jobs=None):
         self.root = root
+        self.jobs = jobs or JobExecutor(root)  # La clasificación y los árboles corren fuera del hilo de Tk
         self.root.title("Visualizador de Algoritmos de Árboles")
         self.current_step = 0
         self.steps = []
         self.algorithm_name = ""
+        self.kind = ""  # "ultramétrico" o "aditivo"
         self.matrix = np.array([
             [0, 2, 4, 6],
             [2, 0, 4, 6],
             [4, 4, 0, 6],
             [6, 6, 6, 0]
         ])
-        self.distances = self.matrix.copy()
-        self.tree_structure = []  # Guardar nodos y relaciones construidas
+        self.labels = ["A", "B", "C", "D"]
+        self.source = self.matrix  # Distancias que reciben los algoritmos (puede ser un memmap)
+        self.metric = None  # (tipo, contraejemplo) de la matriz actual, ver Eduardo/tree_metrics.py
+        self.tree = None  # Árbol calculado por el algoritmo seleccionado
+        self.trace = None  # Uniones del algoritmo, en orden
+        self.cursor = None  # Reproduce la traza sobre la matriz (solo si se muestra)
+        self.layout = None  # Coordenadas del dendrograma de self.tree
         self.create_main_menu()
 
     def create_main_menu(self):
@@ -32,27 +64,155 @@ class TreeVisualizer:
         btn_additive = tk.Button(self.root, text="Árbol Aditivo", command=self.run_additive)
         btn_additive.pack(pady=10, padx=20, fill="x")
 
+        btn_auto = tk.Button(self.root, text="Elegir según la matriz", command=self.run_auto)
+        btn_auto.pack(pady=10, padx=20, fill="x")
+
+        btn_load = tk.Button(self.root, text="Cargar matriz de distancias...", command=self.load_matrix)
+        btn_load.pack(pady=10, padx=20, fill="x")
+
+        btn_bootstrap = tk.Button(self.root, text="Consenso bootstrap de una matriz de caracteres...", command=self.run_bootstrap)
+        btn_bootstrap.pack(pady=10, padx=20, fill="x")
+
+        label_size = tk.Label(self.root, text=f"Matriz actual: {len(self.labels)} taxones")
+        label_size.pack(pady=5)
+
+        self.status = tk.Label(self.root, text="Calculando..." if self.jobs.busy else "")
+        self.status.pack(pady=5)
+
+    def set_status(self, text):
+        if self.status.winfo_exists():
+            self.status.configure(text=text)
+
+    def start_job(self, func, *args, on_done):
+        """Corre func en segundo plano (ver jobs.py) y llama a on_done con su resultado en el hilo de Tk"""
+        def finish(result):
+            self.set_status("")
+            on_done(result)
+
+        def failed(message, details):
+            self.set_status("")
+            messagebox.showerror("Error", message)
+
+        if not self.jobs.start(func, *args, on_done=finish, on_error=failed):
+            messagebox.showinfo("Árboles", "Ya hay un cálculo en curso: espere a que termine.")
+            return
+        self.set_status("Calculando...")
+
+    def load_matrix(self):
+        path = filedialog.askopenfilename(
+            title="Matriz de distancias",
+            filetypes=[("PHYLIP", "*.phy *.phylip *.txt"), ("NumPy", "*.npy"), ("Binario condensado", "*.bin *.dat *.raw"), ("Todos", "*")]
+        )
+        if not path:
+            return
+        try:
+            labels, distances = load_distances(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo leer la matriz: {e}")
+            return
+        self.labels = [str(label) for label in labels]
+        self.source = distances
+        self.metric = None
+        # Solo se arma la matriz cuadrada si es lo bastante chica para mostrarla
+        self.matrix = to_square(distances) if len(labels) <= MAX_SHOWN else None
+        self.create_main_menu()
+
+    def run_bootstrap(self):
+        path = filedialog.askopenfilename(
+            title="Matriz de caracteres",
+            filetypes=[("Alineamiento PHYLIP", "*.phy *.phylip *.txt"), ("NumPy", "*.npy"), ("Todos", "*")]
+        )
+        if not path:
+            return
+        try:
+            labels, characters = load_characters(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo leer la matriz: {e}")
+            return
+        ultrametric = messagebox.askyesnocancel(
+            "Bootstrap", "¿Construir las réplicas con UPGMA (Sí) o con neighbor joining (No)?")
+        if ultrametric is None:
+            return
+        method, name = ("upgma", "UPGMA") if ultrametric else ("nj", "neighbor joining")
+
+        def show(tree):
+            # El consenso no tiene traza: solo se grafica el árbol, con el soporte de cada clado
+            self.algorithm_name = f"Consenso bootstrap ({name}, {REPLICATES} réplicas)"
+            self.kind = "consenso"
+            self.tree, self.trace, self.cursor = tree, None, None
+            self.steps = [("tree", None)]
+            self.start_algorithm()
+
+        self.start_job(_job_bootstrap, characters, method, [str(label) for label in labels], on_done=show)
+
+    def classify(self, then):
+        # La prueba se hace una vez por matriz; then(tipo, contraejemplo) corre cuando está lista
+        if self.metric is not None:
+            then(*self.metric)
+            return
+
+        def done(metric):
+            self.metric = metric
+            then(*metric)
+
+        self.start_job(_job_classify, self.source, self.labels, on_done=done)
+
+    def run_auto(self):
+        def choose(kind, witness):
+            if kind == "ultrametric":
+                self.run_tree("Árbol Ultramétrico", upgma, "ultramétrico")
+                return
+            if kind == "general":
+                messagebox.showinfo("Matriz", f"La matriz no es aditiva (falla el cuarteto {witness}); "
+                                              "el árbol aditivo será una aproximación.")
+            self.run_tree("Árbol Aditivo", neighbor_joining, "aditivo")
+
+        self.classify(choose)
+
     def run_ultrametric(self):
-        self.algorithm_name = "Árbol Ultramétrico"
-        self.steps = [
-            "Paso 1: Mostrar la matriz de distancias inicial.",
-            "Paso 2: Encontrar el par más cercano.",
-            "Paso 3: Actualizar la matriz y construir el árbol.",
-            "Paso 4: Graficar el árbol ultramétrico completo."
-        ]
-        self.tree_structure = []  # Reiniciar estructura del árbol
-        self.start_algorithm()
+        def choose(kind, witness):
+            if kind != "ultrametric" and messagebox.askyesno(
+                    "Matriz", f"La matriz no es ultramétrica (falla el trío {witness}). ¿Construir el árbol aditivo?"):
+                self.run_additive()
+                return
+            self.run_tree("Árbol Ultramétrico", upgma, "ultramétrico")
+
+        self.classify(choose)
 
     def run_additive(self):
-        self.algorithm_name = "Árbol Aditivo"
-        self.steps = [
-            "Paso 1: Mostrar la matriz de distancias inicial.",
-            "Paso 2: Calcular los nodos intermedios.",
-            "Paso 3: Actualizar la matriz y construir el árbol.",
-            "Paso 4: Graficar el árbol aditivo completo."
-        ]
-        self.tree_structure = []  # Reiniciar estructura del árbol
-        self.start_algorithm()
+        def choose(kind, witness):
+            if kind == "general":
+                messagebox.showwarning("Matriz", f"La matriz no es aditiva (falla el cuarteto {witness}); "
+                                                 "el árbol será una aproximación.")
+            self.run_tree("Árbol Aditivo", neighbor_joining, "aditivo")
+
+        self.classify(choose)
+
+    def run_tree(self, name, builder, kind):
+        def show(result):
+            self.algorithm_name = name
+            self.kind = kind
+            self.tree, self.trace, self.cursor = result
+            self.steps = [("matrix", None)] + [("merge", k) for k in range(len(self.trace))] + [("tree", None)]
+            self.start_algorithm()
+
+        self.start_job(_job_tree, builder, self.source, self.labels, self.matrix, on_done=show)
+
+    def node_name(self, v):
+        if self.tree.is_leaf(v):
+            return str(self.tree.labels[v])
+        return f"N{v - self.tree.n_leaves + 1}"
+
+    def step_text(self, index):
+        kind, k = self.steps[index]
+        if kind == "matrix":
+            return f"Paso {index + 1}: Mostrar la matriz de distancias inicial."
+        if kind == "tree":
+            return f"Paso {index + 1}: Graficar el árbol {self.kind} completo."
+        e = self.trace[k]
+        return (f"Paso {index + 1}: Unir {self.node_name(e.keep_node)} y {self.node_name(e.drop_node)} "
+                f"(distancia {e.distance:.2f}) en {self.node_name(e.node)}, con ramas "
+                f"{self.tree.lengths[e.keep_node]:.2f} y {self.tree.lengths[e.drop_node]:.2f}, y actualizar la matriz.")
 
     def on_closing():
         plt.close("all")  # Cierra todas las figuras de matplotlib
@@ -61,6 +221,7 @@ class TreeVisualizer:
     def start_algorithm(self):
         self.clear_window()
         self.current_step = 0
+        self.layout = None
 
         label_title = tk.Label(self.root, text=f"{self.algorithm_name}", font=("Arial", 16))
         label_title.pack(pady=10)
@@ -71,6 +232,12 @@ class TreeVisualizer:
         self.plot_frame = tk.Frame(self.root)
         self.plot_frame.pack(pady=10)
 
+        # Una sola figura y un solo canvas por algoritmo; cada paso solo redibuja los ejes
+        self.fig = Figure()
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.get_tk_widget().pack()
+
         btn_next = tk.Button(self.root, text="Siguiente", command=self.next_step)
         btn_next.pack(side="left", padx=20)
 
@@ -80,6 +247,9 @@ class TreeVisualizer:
         btn_back = tk.Button(self.root, text="Volver", command=self.create_main_menu)
         btn_back.pack(side="right", padx=20)
 
+        btn_newick = tk.Button(self.root, text="Exportar Newick", command=self.export_newick)
+        btn_newick.pack(side="right", padx=20)
+
         self.show_step()
 
     def next_step(self):
@@ -93,54 +263,64 @@ class TreeVisualizer:
             self.show_step()
 
     def show_step(self):
-        step_text = self.steps[self.current_step]
-        self.step_label.config(text=step_text)
-        self.update_plot(step_text)
+        self.step_label.config(text=self.step_text(self.current_step))
+        self.update_plot(*self.steps[self.current_step])
 
-    def update_plot(self, step_text):
-        for widget in self.plot_frame.winfo_children():
-            widget.destroy()
+    def export_newick(self):
+        path = filedialog.asksaveasfilename(defaultextension=".nwk", filetypes=[("Newick", "*.nwk *.newick *.tree")])
+        if path:
+            with open(path, "w") as f:
+                self.tree.write_newick(f)
 
-        fig, ax = plt.subplots()
-        if "Inicial" in step_text:
-            ax.matshow(self.matrix, cmap="coolwarm")
-            for (i, j), val in np.ndenumerate(self.matrix):
-                ax.text(j, i, f"{val}", ha='center', va='center', color='black')
-        elif "más cercano" in step_text:
-            mask = np.eye(*self.distances.shape) * np.inf
-            closest_pair = np.unravel_index(np.argmin(self.distances + mask), self.distances.shape)
-            ax.matshow(self.distances, cmap="coolwarm")
-            for (i, j), val in np.ndenumerate(self.distances):
-                color = 'red' if (i, j) == closest_pair or (j, i) == closest_pair else 'black'
-                ax.text(j, i, f"{val}", ha='center', va='center', color=color)
-        elif "nodos intermedios" in step_text:
-            # Realizar el cálculo de nodos intermedios para el algoritmo aditivo
-            intermediate_values = (self.distances[0, 1] + self.distances[1, 2] - self.distances[0, 2]) / 2
-            ax.text(0.5, 0.5, f"Valor intermedio: {intermediate_values:.2f}", fontsize=12, ha='center')
-            ax.axis('off')
-        elif "Actualizar" in step_text:
-            self.tree_structure.append(((0, 1), 2))  # Ejemplo de agregar nodos
-            ax.plot([0, 1, 2], [0, 1, 0], marker="o")
-            ax.annotate("Nodo A", (0, 0), textcoords="offset points", xytext=(-10, 10), ha='center')
-            ax.annotate("Nodo B", (1, 1), textcoords="offset points", xytext=(0, 10), ha='center')
-            ax.annotate("Nodo C", (2, 0), textcoords="offset points", xytext=(10, 10), ha='center')
-        elif "completo" in step_text:
+    def update_plot(self, kind, k):
+        ax = self.ax
+        ax.clear()
+        if kind == "tree":
             self.plot_complete_tree(ax)
+        elif self.cursor is None:
+            text = f"Matriz de {len(self.labels)} taxones (demasiado grande para mostrarla)"
+            if kind == "merge":
+                text = self.step_text(self.current_step)
+            ax.text(0.5, 0.5, text, ha='center', wrap=True)
+            ax.axis('off')
+        else:
+            # Avanza o retrocede la traza hasta este paso (una unión por clic)
+            self.cursor.seek(0 if kind == "matrix" else k)
+            pair = () if kind == "matrix" else (self.trace[k].keep, self.trace[k].drop)
+            self.plot_matrix(ax, pair)
 
-        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        canvas_widget = canvas.get_tk_widget()
-        canvas_widget.pack()
-        canvas.draw()
-        plt.close(fig)  # Cierra la figura una vez dibujada
+        self.canvas.draw_idle()
 
+    def plot_matrix(self, ax, pair):
+        # Submatriz de las ranuras activas, con el par que se une en rojo
+        slots = np.flatnonzero(self.cursor.active)
+        matrix = self.cursor.matrix[np.ix_(slots, slots)]
+        ax.matshow(matrix, cmap="coolwarm")
+        for (i, j), val in np.ndenumerate(matrix):
+            color = 'red' if i != j and slots[i] in pair and slots[j] in pair else 'black'
+            ax.text(j, i, f"{val:.2f}", ha='center', va='center', color=color)
+        names = [self.node_name(v) for v in self.cursor.node_of[slots]]
+        ax.set_xticks(range(len(slots)), names)
+        ax.set_yticks(range(len(slots)), names)
 
     def plot_complete_tree(self, ax):
-        # Gráfico combinado de todos los pasos
-        x = [0, 1, 2, 3]
-        y = [0, 1, 0, -1]
-        ax.plot(x, y, marker="o")
-        for i, label in enumerate(["A", "B", "C", "D"]):
-            ax.annotate(f"Nodo {label}", (x[i], y[i]), textcoords="offset points", xytext=(0, 10), ha='center')
+        # Dendrograma: un único LineCollection con los codos de todas las ramas;
+        # el layout se calcula una vez por árbol
+        if self.layout is None:
+            self.layout = dendrogram_layout(self.tree)
+        x, y, segments = self.layout
+        ax.add_collection(LineCollection(segments, colors="tab:blue", linewidths=1))
+        ax.autoscale_view()
+        n = self.tree.n_leaves
+        if n <= MAX_SHOWN:
+            for leaf in range(n):
+                ax.annotate(f"Nodo {self.tree.labels[leaf]}", (x[leaf], y[leaf]), textcoords="offset points", xytext=(0, -15), ha='center')
+            if self.tree.support is not None:
+                # Soporte bootstrap sobre cada nodo interno que lo tiene
+                for v in np.flatnonzero(~np.isnan(self.tree.support)):
+                    ax.annotate(f"{self.tree.support[v]:.0%}", (x[v], y[v]), textcoords="offset points", xytext=(0, 4), ha='center', fontsize=8)
+        ax.set_ylabel("Altura")
+        ax.set_xticks([])
 
     def clear_window(self):
         for widget in self.root.winfo_children():
@@ -0,0 +1,349 @@
+"""Soporte bootstrap de los clados de un árbol de distancias.
+
+Cada réplica remuestrea con reemplazo las columnas de la matriz de caracteres
+(taxones x sitios), calcula su matriz de distancias y arma su árbol. Los clados
+se representan como bitsets de hojas (palabras uint64) y no se guarda ningún
+árbol de réplica: cada proceso resume sus clados en un contador acotado de
+Misra–Gries y, si ese resumen tuvo que descartar algo, una segunda pasada sobre
+las mismas semillas cuenta exactamente solo los clados candidatos. Con esos
+conteos se arma el consenso de mayoría extendido, anotado con el soporte de
+cada clado.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from Eduardo.trees import Tree, neighbor_joining, to_condensed, upgma
+
+BUILDERS = {"upgma": (upgma, True), "nj": (neighbor_joining, False)}  # (constructor, con raíz)
+BLOCKS = 256  # bloques de semillas en que se reparten las réplicas
+
+_boot = {}
+
+
+def character_distances(characters, metric="hamming"):
+    """Vector condensado float32 de distancias entre las filas (taxones) de la matriz de caracteres.
+
+    "hamming" es la proporción de sitios distintos (p-distancia) y se calcula
+    con un producto de matrices por cada estado; "euclidean" usa |x|² + |y|² - 2x·y.
+    """
+    x = np.asarray(characters)
+    n, m = x.shape
+    if metric == "hamming":
+        same = np.zeros((n, n), dtype=np.float32)
+        for state in np.unique(x):
+            a = (x == state).astype(np.float32)
+            same += a @ a.T
+        d = 1 - same / max(m, 1)
+    elif metric == "euclidean":
+        a = x.astype(np.float64)
+        sq = (a * a).sum(axis=1)
+        d = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2 * a @ a.T, 0))
+    else:
+        raise ValueError(f"Métrica desconocida: {metric}")
+    np.fill_diagonal(d, 0)
+    return to_condensed(d)
+
+
+def read_alignment(path):
+    """Lee un alineamiento PHYLIP secuencial: "n m" en la primera línea y luego cada etiqueta con sus m sitios.
+
+    La secuencia de un taxón puede tener espacios o seguir en las líneas
+    siguientes. Devuelve (etiquetas, matriz uint8 n x m con un byte por sitio).
+    """
+    with open(path) as f:
+        header = f.readline().split()
+        if len(header) < 2:
+            raise ValueError("Faltan el número de taxones y de sitios en la primera línea.")
+        n, m = int(header[0]), int(header[1])
+        characters = np.empty((n, m), dtype=np.uint8)
+        labels = []
+        row = None
+        for line in f:
+            text = line.strip()
+            if not text:
+                continue
+            if row is None:
+                if len(labels) == n:
+                    raise ValueError(f"Hay más de {n} taxones.")
+                label, *rest = text.split(None, 1)
+                labels.append(label)
+                text = rest[0] if rest else ""
+                row = bytearray()
+            row += "".join(text.split()).upper().encode("ascii")
+            if len(row) >= m:
+                if len(row) > m:
+                    raise ValueError(f"El taxón {labels[-1]} tiene {len(row)} sitios y se esperaban {m}.")
+                characters[len(labels) - 1] = np.frombuffer(bytes(row), dtype=np.uint8)
+                row = None
+    if row is not None or len(labels) != n:
+        raise ValueError(f"Se esperaban {n} taxones con {m} sitios cada uno.")
+    return labels, characters
+
+
+def load_characters(path):
+    """Etiquetas y matriz de caracteres (taxones x sitios) de un .npy o un alineamiento PHYLIP"""
+    if os.path.splitext(path)[1].lower() == ".npy":
+        characters = np.load(path)
+        if characters.ndim != 2:
+            raise ValueError("Se esperaba una matriz de taxones x sitios.")
+        return list(range(len(characters))), characters
+    return read_alignment(path)
+
+
+def _node_bitsets(tree, rooted):
+    """Bitsets de hojas de todos los nodos (hojas y nodos internos) en palabras uint64.
+
+    Sin raíz, cada clado se reemplaza por su complemento si contiene la hoja 0,
+    para que la misma bipartición tenga siempre el mismo bitset.
+    """
+    n = tree.n_leaves
+    words = (n + 63) // 64
+    bits = np.zeros((n + len(tree.children), words), dtype=np.uint64)
+    leaves = np.arange(n)
+    bits[leaves, leaves // 64] = np.left_shift(np.uint64(1), (leaves % 64).astype(np.uint64))
+    for k, (a, b) in enumerate(tree.children):
+        bits[n + k] = bits[a] | bits[b]
+    if not rooted:
+        full = _full_mask(n)
+        flip = (bits[:, 0] & np.uint64(1)).astype(bool)
+        bits[flip] = ~bits[flip] & full
+    return bits
+
+
+def _full_mask(n):
+    full = np.full((n + 63) // 64, np.iinfo(np.uint64).max, dtype=np.uint64)
+    if n % 64:
+        full[-1] = np.uint64((1 << (n % 64)) - 1)
+    return full
+
+
+def clade_bitsets(tree, rooted=True):
+    """Bitsets de hojas de cada nodo interno (fila v - n_leaves) en palabras uint64 (ver _node_bitsets)"""
+    return _node_bitsets(tree, rooted)[tree.n_leaves:]
+
+
+def _clade_leaves(bits, n):
+    idx = np.arange(n)
+    return np.flatnonzero((bits[idx // 64] >> (idx % 64).astype(np.uint64)) & np.uint64(1))
+
+
+def _sizes(clades):
+    """Número de hojas de cada bitset"""
+    size = np.zeros(len(clades), dtype=np.int64)
+    for w in range(clades.shape[1]):
+        size += np.unpackbits(clades[:, w:w + 1].view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+    return size
+
+
+def _informative(clades, n, rooted):
+    """Clados que pueden tener soporte: ni la raíz, ni una sola hoja, ni (sin raíz) n - 1 hojas"""
+    size = _sizes(clades)
+    return (size > 1) & (size < (n if rooted else n - 1))
+
+
+def _slots(n):
+    """Capacidad del resumen: un clado en más de la mitad de las réplicas nunca se descarta"""
+    return 2 * max(n - 2, 1)
+
+
+def _reduce(summary, slots):
+    """Paso de Misra–Gries: si hay más de `slots` clados, resta a todos el conteo
+    (slots + 1)-ésimo mayor y descarta los que no quedan positivos. Devuelve si descartó algo.
+
+    Cada resta quita ese conteo a slots + 1 clados a la vez, así que un clado
+    pierde a lo sumo total / (slots + 1), con total = réplicas x clados por árbol.
+    """
+    if len(summary) <= slots:
+        return False
+    cut = sorted((entry[0] for entry in summary.values()), reverse=True)[slots]
+    for key in [key for key, entry in summary.items() if entry[0] <= cut]:
+        del summary[key]
+    for entry in summary.values():
+        entry[0] -= cut
+    return True
+
+
+def _init_bootstrap_worker(characters, metric, method):
+    _boot['characters'] = characters
+    _boot['metric'] = metric
+    _boot['method'] = method
+
+def _replicate_clades(seed):
+    """(largos de las ramas de las hojas, {clado informativo: largo de su rama}) de la réplica de `seed`"""
+    characters = _boot['characters']
+    builder, rooted = BUILDERS[_boot['method']]
+    m = characters.shape[1]
+    rng = np.random.default_rng(seed)
+    tree = builder(character_distances(characters[:, rng.integers(0, m, size=m)], _boot['metric']))
+    bits = _node_bitsets(tree, rooted)
+    n = tree.n_leaves
+    leaf_of = {bits[v].tobytes(): v for v in range(n)}
+    leaves = np.zeros(n)
+    clades = {}
+    # Sin raíz, los dos hijos de la raíz son la misma bipartición: sus largos se suman
+    for v in range(len(bits) - 1):
+        key = bits[v].tobytes()
+        if key in leaf_of:
+            leaves[leaf_of[key]] += tree.lengths[v]
+        else:
+            clades[key] = clades.get(key, 0.0) + float(tree.lengths[v])
+    return leaves, clades
+
+def _summary_chunk(seeds):
+    """Resumen de Misra–Gries {clado: [conteo, suma de largos]}, sumas de las hojas y si se descartó algo"""
+    summary = {}
+    leaves = 0.0
+    lossy = False
+    for seed in seeds:
+        leaf_lengths, clades = _replicate_clades(seed)
+        leaves = leaves + leaf_lengths
+        for key, length in clades.items():
+            entry = summary.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += length
+        lossy |= _reduce(summary, _slots(len(leaf_lengths)))
+    return summary, leaves, lossy
+
+def _count_chunk(seeds, candidates):
+    """Conteo exacto {clado: [réplicas que lo contienen, suma de largos]} solo de los candidatos"""
+    counts = {key: [0, 0.0] for key in candidates}
+    for seed in seeds:
+        for key, length in _replicate_clades(seed)[1].items():
+            entry = counts.get(key)
+            if entry is not None:
+                entry[0] += 1
+                entry[1] += length
+    return counts
+
+
+def _consensus_tree(stats, leaves, n, replicates, rooted, labels):
+    """Consenso de mayoría extendido: se agregan los clados del más al menos frecuente si son compatibles.
+
+    Los clados con más de la mitad de las réplicas siempre son compatibles
+    entre sí, así que todos entran; los demás completan la resolución. Lo que
+    quede sin resolver se une con ramas de largo 0 y soporte NaN. Sin raíz, el
+    árbol se enraíza entre la hoja 0 y el resto. leaves[i] es la suma de los
+    largos de la rama de la hoja i en todas las réplicas.
+    """
+    words = (n + 63) // 64
+    keys = list(stats)
+    bits = np.frombuffer(b"".join(keys), dtype=np.uint64).reshape(-1, words)
+    useful = np.flatnonzero(_informative(bits, n, rooted))
+    order = sorted(useful, key=lambda i: (-stats[keys[i]][0], keys[i]))
+
+    accepted = np.empty((max(n - 2, 0), words), dtype=np.uint64)
+    chosen = []
+    for i in order:
+        if len(chosen) == len(accepted):
+            break
+        clade, previous = bits[i], accepted[:len(chosen)]
+        common = previous & clade
+        # Compatibles: disjuntos o uno contenido en el otro
+        if ((common == 0).all(axis=1) | (common == clade).all(axis=1) | (common == previous).all(axis=1)).all():
+            accepted[len(chosen)] = clade
+            chosen.append(i)
+
+    def mean_length(key):
+        count, total = stats.get(key, (0, 0.0))
+        return total / count if count else 0.0
+
+    clades = [(len(_clade_leaves(bits[i], n)), keys[i], stats[keys[i]][0] / replicates) for i in chosen]
+    if not rooted and n > 1:
+        # Todas menos la hoja 0: su rama es la de la hoja 0 partida en dos
+        rest = _full_mask(n)
+        rest[0] &= ~np.uint64(1)
+        clades.append((n - 1, rest.tobytes(), np.nan))
+    clades.sort(key=lambda c: c[0])
+
+    children = []
+    lengths = np.zeros(max(2 * n - 1, 1))
+    support = np.full(max(2 * n - 1, 1), np.nan)
+    lengths[:n] = leaves / replicates
+    top = np.arange(n)  # nodo más alto armado hasta ahora sobre cada hoja
+
+    def join(nodes):
+        node = nodes[0]
+        for other in nodes[1:]:
+            children.append((int(node), int(other)))
+            node = n + len(children) - 1
+        return node
+
+    for size, key, frequency in clades:
+        leaves = _clade_leaves(np.frombuffer(key, dtype=np.uint64), n)
+        v = join(np.unique(top[leaves]))
+        support[v] = frequency
+        lengths[v] = mean_length(key)
+        top[leaves] = v
+    if not rooted and n > 1:
+        lengths[0] = lengths[top[1]] = lengths[0] / 2
+    join(np.unique(top))
+    tree = Tree(labels, children, lengths[:n + len(children)])
+    tree.support = support[:n + len(children)]
+    return tree
+
+
+def bootstrap_support(characters, replicates=100, method="upgma", metric="hamming",
+                      labels=None, workers=None, seed=0):
+    """Árbol consenso de las réplicas bootstrap con el soporte de cada clado.
+
+    Devuelve el consenso de mayoría extendido (ver _consensus_tree) con
+    tree.support[v] = fracción de réplicas que contienen el clado del nodo v
+    (NaN en hojas, raíz y nodos agregados para resolver politomías) y cada rama
+    con el largo medio del clado en las réplicas que lo contienen. Las réplicas
+    se arman en un ProcessPoolExecutor, en bloques de semillas. Cada resumen
+    guarda a lo sumo 2(n - 2) clados, así que la memoria no crece con el número
+    de réplicas, y todo clado presente en más de la mitad de ellas sobrevive. Si
+    algún resumen descartó clados, las réplicas se rearman una segunda vez para
+    contar exactamente solo los candidatos (el doble de trabajo); si hubo a lo
+    sumo 2(n - 2) clados distintos, basta una pasada.
+    """
+    if method not in BUILDERS:
+        raise ValueError(f"Método desconocido: {method}")
+    characters = np.asarray(characters)
+    _, rooted = BUILDERS[method]
+    n = len(characters)
+    labels = list(range(n)) if labels is None else list(labels)
+
+    seeds = np.random.SeedSequence(seed).generate_state(replicates, dtype=np.uint64)
+    workers = workers or os.cpu_count() or 1
+    # Los bloques no dependen de workers: los resúmenes, y con ellos el árbol, tampoco
+    chunk = max(1, -(-replicates // BLOCKS))
+    blocks = [seeds[s:s + chunk] for s in range(0, replicates, chunk)]
+    slots = _slots(n)
+    summary = {}
+    leaves = np.zeros(n)
+    lossy = False
+
+    def run(pool_map):
+        nonlocal leaves, lossy
+        for part, leaf_lengths, dropped in pool_map(_summary_chunk, blocks):
+            leaves = leaves + leaf_lengths
+            lossy |= dropped
+            for key, (count, total) in part.items():
+                entry = summary.setdefault(key, [0, 0.0])
+                entry[0] += count
+                entry[1] += total
+            lossy |= _reduce(summary, slots)
+        if not lossy:
+            return summary  # el resumen nunca descartó nada: los conteos son exactos
+        # Segunda pasada: conteo exacto de los candidatos que sobrevivieron
+        stats = {key: [0, 0.0] for key in summary}
+        for counts in pool_map(_count_chunk, blocks, repeat(list(summary), len(blocks))):
+            for key, (count, total) in counts.items():
+                stats[key][0] += count
+                stats[key][1] += total
+        return stats
+
+    if workers == 1 or len(blocks) <= 1:
+        _init_bootstrap_worker(characters, metric, method)
+        stats = run(map)
+    else:
+        # spawn: se puede llamar desde un hilo de la interfaz sin heredar su estado
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_bootstrap_worker, initargs=(characters, metric, method)) as pool:
+            stats = run(pool.map)
+    return _consensus_tree(stats, leaves, n, max(replicates, 1), rooted, labels)
@@ -0,0 +1,105 @@
+"""Lectura de matrices de distancias grandes sin cargarlas enteras en memoria.
+
+Los constructores de Eduardo/trees.py aceptan el vector condensado (triángulo
+superior por filas) que devuelven estas funciones, incluido un np.memmap.
+"""
+import os
+
+import numpy as np
+
+from Eduardo.trees import condensed_index, condensed_size
+
+
+def open_condensed(path, dtype=np.float32, mode="r"):
+    """Abre un vector condensado (o matriz cuadrada) .npy, o binario crudo de `dtype`, como memmap"""
+    if os.path.splitext(path)[1] == ".npy":
+        distances = np.load(path, mmap_mode=mode)
+    else:
+        distances = np.memmap(path, dtype=dtype, mode=mode)
+    if distances.ndim == 1:
+        condensed_size(len(distances))  # valida el largo
+    elif distances.ndim != 2 or distances.shape[0] != distances.shape[1]:
+        raise ValueError("Se esperaba un vector condensado o una matriz cuadrada.")
+    return distances
+
+
+def read_phylip(path, dtype=np.float32, out=None):
+    """Lee una matriz PHYLIP (cuadrada o triangular inferior) línea a línea.
+
+    Cada fila se convierte directo a un arreglo de `dtype` y se escribe en el
+    vector condensado, sin listas de floats de Python. Si `out` es una ruta,
+    el resultado se guarda ahí como .npy mapeado en memoria. Acepta filas
+    partidas en varias líneas. Devuelve (etiquetas, vector condensado).
+    """
+    with open(path) as f:
+        header = f.readline().split()
+        if not header:
+            raise ValueError("Falta el número de taxones en la primera línea.")
+        n = int(header[0])
+        m = n * (n - 1) // 2
+        if out is None:
+            condensed = np.empty(m, dtype=dtype)
+        else:
+            condensed = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=(m,))
+
+        labels = []
+        square = None
+        for i, (label, row) in enumerate(_phylip_rows(f, n)):
+            if square is None:
+                # La primera fila define el formato: n valores (cuadrada), 0 o 1 (triangular)
+                square = len(row) == n and n > 1
+            labels.append(label)
+            if square:
+                if len(row) != n:
+                    raise ValueError(f"La fila {i + 1} debe tener {n} valores.")
+                start = condensed_index(n, i, i + 1) if i < n - 1 else m
+                condensed[start:start + n - i - 1] = row[i + 1:]
+            else:
+                if len(row) not in (i, i + 1):
+                    raise ValueError(f"La fila {i + 1} debe tener {i} valores (o {i + 1} con la diagonal).")
+                # d(j, i) con j < i está en la columna i del triángulo superior
+                j = np.arange(i)
+                condensed[n * j - j * (j + 1) // 2 + (i - j - 1)] = row[:i]
+        if len(labels) != n:
+            raise ValueError(f"Se esperaban {n} filas y hay {len(labels)}.")
+    if out is not None:
+        condensed.flush()
+    return labels, condensed
+
+
+def _phylip_rows(lines, n):
+    """(etiqueta, valores) de cada fila; una fila sigue en la línea siguiente si le faltan valores"""
+    square, extra = None, 0  # valores por fila: n (cuadrada), i + extra (triangular)
+    label, parts, have, i = None, [], 0, 0
+    for line in lines:
+        text = line.strip()
+        if not text:
+            continue
+        if label is None:
+            label, *rest = text.split(None, 1)
+            text = rest[0] if rest else ""
+        values = np.fromstring(text, sep=" ") if text else np.empty(0)
+        if square is None:
+            # La primera fila define el formato: 0 o 1 valores es triangular inferior
+            square = len(values) > 1 or n == 1
+            extra = len(values)
+        parts.append(values)
+        have += len(values)
+        if have >= (n if square else i + extra):
+            yield label, np.concatenate(parts)
+            label, parts, have, i = None, [], 0, i + 1
+    if label is not None:
+        yield label, np.concatenate(parts)
+
+
+def load_distances(path, dtype=np.float32):
+    """Etiquetas y distancias de un archivo .npy, binario crudo o PHYLIP.
+
+    Los binarios se abren como memmap y se etiquetan 0..n-1.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".npy", ".bin", ".dat", ".raw"):
+        distances = open_condensed(path, dtype=dtype)
+        n = len(distances) if distances.ndim == 2 else condensed_size(len(distances))
+        return list(range(n)), distances
+    return read_phylip(path, dtype=dtype)
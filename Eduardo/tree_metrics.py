@@ -0,0 +1,132 @@
+"""Pruebas de los tres y cuatro puntos para decidir qué árbol representa una matriz.
+
+Una matriz es ultramétrica si en cada trío el máximo de las tres distancias
+aparece al menos dos veces, y aditiva (de árbol) si en cada cuarteto el máximo
+de d(i,j)+d(k,l), d(i,k)+d(j,l), d(i,l)+d(j,k) aparece al menos dos veces.
+Las funciones devuelven (cumple, contraejemplo): el contraejemplo es el primer
+trío o cuarteto que falla, o None.
+"""
+import numpy as np
+
+from Eduardo.trees import condensed_size, to_square
+
+
+def _gap(s1, s2, s3):
+    """Diferencia entre el mayor y el segundo mayor de tres arreglos"""
+    high = np.maximum(np.maximum(s1, s2), s3)
+    low = np.minimum(np.minimum(s1, s2), s3)
+    return high - (s1 + s2 + s3 - high - low)
+
+
+def _block_rows(cells, memory):
+    """Filas por bloque para que cada arreglo temporal tenga a lo sumo `memory` elementos"""
+    return max(1, memory // max(cells, 1))
+
+
+def check_ultrametric(distances, tol=1e-6, sample=None, seed=0, memory=1 << 22):
+    """Prueba de los tres puntos sobre todos los tríos i < j < k (O(n³) en bloques de NumPy).
+
+    Con sample=s solo se prueban s tríos al azar, leyendo las distancias del
+    vector condensado o memmap sin armar la matriz cuadrada.
+    """
+    if sample is not None:
+        return _check_sampled(distances, 3, tol, sample, seed)
+    d = to_square(distances)
+    n = len(d)
+    for i in range(n - 2):
+        rest = d[i, i + 1:]
+        step = _block_rows(len(rest), memory)
+        for start in range(i + 1, n - 1, step):
+            rows = np.arange(start, min(start + step, n - 1))
+            # Trío (i, j, k) con j en el bloque y k > i: el caso k <= j se repite o es trivial
+            bad = _gap(d[i, rows][:, None], rest[None, :], d[rows, i + 1:]) > tol
+            if bad.any():
+                r, c = np.unravel_index(np.argmax(bad), bad.shape)
+                return False, (i, int(rows[r]), i + 1 + int(c))
+    return True, None
+
+
+def check_additive(distances, tol=1e-6, sample=None, seed=0, memory=1 << 22):
+    """Prueba de los cuatro puntos sobre todos los cuartetos (O(n⁴) en bloques de NumPy).
+
+    Con sample=s solo se prueban s cuartetos al azar (ver check_ultrametric).
+    """
+    if sample is not None:
+        return _check_sampled(distances, 4, tol, sample, seed)
+    d = to_square(distances)
+    n = len(d)
+    for i in range(n - 3):
+        # Para i fijo, k y l recorren i+1.. y j un bloque de filas
+        rest = d[i, i + 1:]
+        inner = d[i + 1:, i + 1:]
+        step = _block_rows(len(rest) ** 2, memory)
+        for start in range(i + 1, n - 2, step):
+            rows = np.arange(start, min(start + step, n - 2))
+            dj = d[rows, i + 1:]
+            s1 = d[i, rows][:, None, None] + inner[None, :, :]  # d(i,j) + d(k,l)
+            s2 = rest[None, :, None] + dj[:, None, :]           # d(i,k) + d(j,l)
+            s3 = rest[None, None, :] + dj[:, :, None]           # d(i,l) + d(j,k)
+            bad = _gap(s1, s2, s3) > tol
+            if bad.any():
+                r, k, l = np.unravel_index(np.argmax(bad), bad.shape)
+                return False, (i, int(rows[r]), i + 1 + int(k), i + 1 + int(l))
+    return True, None
+
+
+def _lookup(distances):
+    """Función vectorizada d(i, j) sobre una matriz cuadrada o un vector condensado"""
+    distances = np.asarray(distances) if not isinstance(distances, np.ndarray) else distances
+    if distances.ndim == 2:
+        return len(distances), lambda i, j: distances[i, j].astype(np.float64)
+    n = condensed_size(len(distances))
+
+    def get(i, j):
+        lo, hi = np.minimum(i, j), np.maximum(i, j)
+        same = lo == hi
+        idx = n * lo - lo * (lo + 1) // 2 + (hi - lo - 1)
+        values = distances[np.where(same, 0, idx)].astype(np.float64)
+        values[same] = 0
+        return values
+    return n, get
+
+
+def _check_sampled(distances, points, tol, sample, seed, chunk=1 << 16):
+    n, get = _lookup(distances)
+    if n < points:
+        return True, None
+    rng = np.random.default_rng(seed)
+    done = 0
+    while done < sample:
+        size = min(chunk, sample - done)
+        idx = rng.integers(0, n, size=(points, size))
+        if points == 3:
+            i, j, k = idx
+            gap = _gap(get(i, j), get(i, k), get(j, k))
+        else:
+            i, j, k, l = idx
+            gap = _gap(get(i, j) + get(k, l), get(i, k) + get(j, l), get(i, l) + get(j, k))
+        bad = np.flatnonzero(gap > tol)
+        if len(bad):
+            return False, tuple(int(x) for x in idx[:, bad[0]])
+        done += size
+    return True, None
+
+
+def classify_distances(distances, tol=1e-6, exact_up_to=(400, 80), sample=200_000, seed=0):
+    """Tipo de árbol que representa la matriz: "ultrametric", "additive" o "general".
+
+    Las pruebas son exactas hasta exact_up_to = (taxones para tres puntos,
+    taxones para cuatro puntos) y por muestreo de `sample` tríos o cuartetos
+    por encima. Con los valores por defecto cada prueba exacta tarda a lo sumo
+    unas décimas de segundo. Devuelve (tipo, contraejemplo de la prueba que
+    falló o None).
+    """
+    n = len(distances) if np.ndim(distances) == 2 else condensed_size(len(distances))
+    three, four = exact_up_to
+    ok, witness = check_ultrametric(distances, tol, sample=None if n <= three else sample, seed=seed)
+    if ok:
+        return "ultrametric", None
+    ok, additive_witness = check_additive(distances, tol, sample=None if n <= four else sample, seed=seed)
+    if ok:
+        return "additive", witness
+    return "general", additive_witness
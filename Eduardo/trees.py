@@ -0,0 +1,529 @@
+import io
+import re
+from collections import namedtuple
+
+import numpy as np
+
+
+def condensed_index(n, i, j):
+    """Posición del par (i, j), i != j, en el vector condensado (triángulo superior por filas)"""
+    if i > j:
+        i, j = j, i
+    return n * i - i * (i + 1) // 2 + (j - i - 1)
+
+def to_condensed(matrix, dtype=np.float32):
+    """Triángulo superior (sin diagonal) de una matriz cuadrada de distancias"""
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada.")
+    # Fila por fila, para no crear los índices del triángulo (2 enteros por par)
+    n = len(matrix)
+    condensed = np.empty(n * (n - 1) // 2, dtype=dtype)
+    start = 0
+    for i in range(n - 1):
+        condensed[start:start + n - i - 1] = matrix[i, i + 1:]
+        start += n - i - 1
+    return condensed
+
+def condensed_size(m):
+    """Número de taxones n de un vector condensado de largo n(n-1)/2"""
+    n = int((1 + np.sqrt(1 + 8 * m)) / 2)
+    if n * (n - 1) // 2 != m:
+        raise ValueError("El largo no corresponde a un vector condensado.")
+    return n
+
+def _as_condensed(distances):
+    distances = np.asarray(distances)
+    if distances.ndim == 2:
+        return to_condensed(distances)
+    return distances
+
+
+class Tree:
+    """Árbol binario con raíz.
+
+    Las hojas son los nodos 0..n-1 y el nodo interno creado en la unión k es
+    n + k; la raíz es el último. lengths[v] es el largo de la rama de v hacia
+    su padre; heights (solo en árboles ultramétricos) es la altura de cada nodo
+    y support (si se calculó, ver Eduardo/bootstrap.py) el soporte de cada clado.
+    """
+
+    def __init__(self, labels, children, lengths, heights=None):
+        self.labels = list(labels)
+        self.children = [tuple(c) for c in children]
+        self.lengths = np.asarray(lengths, dtype=np.float64)
+        self.heights = None if heights is None else np.asarray(heights, dtype=np.float64)
+        self.support = None
+
+    @property
+    def n_leaves(self):
+        return len(self.labels)
+
+    @property
+    def root(self):
+        return self.n_leaves + len(self.children) - 1
+
+    def is_leaf(self, node):
+        return node < self.n_leaves
+
+    def leaves(self, node=None):
+        """Hojas bajo node (por defecto la raíz), de izquierda a derecha"""
+        stack = [self.root if node is None else node]
+        result = []
+        while stack:
+            v = stack.pop()
+            if self.is_leaf(v):
+                result.append(v)
+            else:
+                stack.extend(reversed(self.children[v - self.n_leaves]))
+        return result
+
+    def depths(self):
+        """Distancia de cada nodo a la raíz sumando los largos de rama"""
+        depth = np.zeros(self.n_leaves + len(self.children))
+        for k in range(len(self.children) - 1, -1, -1):
+            v = self.n_leaves + k
+            for child in self.children[k]:
+                depth[child] = depth[v] + self.lengths[child]
+        return depth
+
+    def write_newick(self, f, chunk=4096):
+        """Escribe el árbol en formato Newick en el archivo f, sin recursión.
+
+        Los fragmentos se acumulan y se escriben cada `chunk` piezas, así el
+        texto completo nunca se arma en memoria.
+        """
+        buffer = []
+        # La pila mezcla nodos por abrir (int), texto literal (str) y el
+        # largo de rama que va tras cerrar un nodo interno (tupla)
+        stack = [self.root]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                buffer.append(item)
+                continue
+            if isinstance(item, tuple):
+                v = item[0]
+                # El soporte va como etiqueta del nodo interno: ")0.95:0.1"
+                if self.support is not None and not np.isnan(self.support[v]):
+                    buffer.append(f"{self.support[v]:.4g}")
+            elif self.is_leaf(item):
+                v = item
+                buffer.append(_newick_label(self.labels[v]))
+            else:
+                a, b = self.children[item - self.n_leaves]
+                stack.extend([(item,), ")", b, ",", a])
+                buffer.append("(")
+                continue
+            if v != self.root:
+                buffer.append(f":{self.lengths[v]:.10g}")
+            if len(buffer) >= chunk:
+                f.write("".join(buffer))
+                buffer.clear()
+        buffer.append(";\n")
+        f.write("".join(buffer))
+
+    def to_newick(self):
+        """Texto Newick del árbol"""
+        f = io.StringIO()
+        self.write_newick(f)
+        return f.getvalue()
+
+    def to_linkage(self):
+        """Matriz de enlace estilo scipy (a, b, distancia, tamaño) de un árbol ultramétrico"""
+        if self.heights is None:
+            raise ValueError("Solo los árboles ultramétricos tienen matriz de enlace.")
+        size = np.ones(self.n_leaves + len(self.children), dtype=np.int64)
+        linkage = np.empty((len(self.children), 4))
+        for k, (a, b) in enumerate(self.children):
+            v = self.n_leaves + k
+            size[v] = size[a] + size[b]
+            linkage[k] = (min(a, b), max(a, b), 2 * self.heights[v], size[v])
+        return linkage
+
+
+MergeEvent = namedtuple("MergeEvent", "keep drop keep_node drop_node node distance before after")
+MergeEvent.__doc__ = """Unión de las ranuras keep y drop de la matriz (con sus nodos del árbol) en node.
+
+distance es la distancia entre ambas al unirlas; before y after son la fila
+de keep antes y después de actualizarla (NaN en ranuras inactivas), o None
+si la traza no guarda filas.
+"""
+
+
+class MergeTrace:
+    """Registro de las uniones de upgma/neighbor_joining, en el orden en que se hicieron"""
+
+    def __init__(self, record_rows=True):
+        self.record_rows = record_rows
+        self.events = []
+
+    def __len__(self):
+        return len(self.events)
+
+    def __getitem__(self, k):
+        return self.events[k]
+
+    def __iter__(self):
+        return iter(self.events)
+
+
+class TraceCursor:
+    """Recorre una MergeTrace hacia adelante y atrás aplicando o deshaciendo una unión por paso.
+
+    matrix es la matriz de distancias en la posición actual (solo cambia la fila
+    y columna de la ranura unida) y node_of el nodo del árbol en cada ranura.
+    La matriz es una copia cuadrada float32 en RAM (4·n² bytes): pensada para
+    las matrices que se muestran en pantalla, no para entradas memmap grandes.
+    """
+
+    def __init__(self, distances, trace):
+        self.matrix = to_square(distances, np.float32)
+        self.trace = trace
+        self.active = np.ones(len(self.matrix), dtype=bool)
+        self.node_of = np.arange(len(self.matrix))
+        self.position = 0
+
+    def _set_row(self, slot, row):
+        # Solo se escriben las ranuras activas: las inactivas conservan su último
+        # valor, que es el que vuelve a valer al deshacer la unión que las apagó
+        known = ~np.isnan(row)
+        self.matrix[slot, known] = self.matrix[known, slot] = row[known]
+
+    def forward(self):
+        e = self.trace[self.position]
+        if e.after is not None:
+            self._set_row(e.keep, e.after)
+        self.active[e.drop] = False
+        self.node_of[e.keep] = e.node
+        self.position += 1
+
+    def backward(self):
+        self.position -= 1
+        e = self.trace[self.position]
+        if e.before is not None:
+            self._set_row(e.keep, e.before)
+        self.active[e.drop] = True
+        self.node_of[e.keep] = e.keep_node
+
+    def seek(self, position):
+        position = max(0, min(position, len(self.trace)))
+        while self.position < position:
+            self.forward()
+        while self.position > position:
+            self.backward()
+
+
+def _trace_row(row, active):
+    row = np.array(row, dtype=np.float64)
+    row[~active] = np.nan
+    return row
+
+
+def _newick_label(label):
+    """Etiqueta Newick; se pone entre comillas si tiene caracteres reservados"""
+    label = str(label)
+    if re.search(r"[\s(),:;'\[\]]", label):
+        return "'" + label.replace("'", "''") + "'"
+    return label
+
+
+def dendrogram_layout(tree):
+    """Coordenadas del dendrograma en O(n) y sus segmentos para un LineCollection.
+
+    Las hojas van en x = 0..n-1 en el orden del árbol y cada nodo interno en
+    el punto medio de sus hijos; y es la distancia a la hoja más lejana (la
+    altura en un árbol ultramétrico). Devuelve (x, y, segments) con segments
+    de forma (nodos - 1, 3, 2): el codo de cada hijo hasta su padre.
+    """
+    depth = tree.depths()
+    y = depth.max() - depth
+    x = np.zeros(len(depth))
+    x[tree.leaves()] = np.arange(tree.n_leaves)
+    children = np.asarray(tree.children, dtype=np.int64).reshape(-1, 2)
+    for k, (a, b) in enumerate(children):
+        x[tree.n_leaves + k] = (x[a] + x[b]) / 2
+
+    parent = np.repeat(np.arange(tree.n_leaves, len(depth)), 2)
+    child = children.ravel()
+    segments = np.empty((len(child), 3, 2))
+    segments[:, 0, 0] = segments[:, 1, 0] = x[child]
+    segments[:, 0, 1] = y[child]
+    segments[:, 1, 1] = segments[:, 2, 1] = y[parent]
+    segments[:, 2, 0] = x[parent]
+    return x, y, segments
+
+
+def upgma(distances, labels=None, overwrite=False, trace=None):
+    """Árbol ultramétrico por UPGMA (enlace promedio) sobre un vector condensado float32.
+
+    Usa la cadena de vecinos más cercanos: memoria O(n²) solo por el vector
+    condensado y tiempo O(n²), con cada fila leída y actualizada en NumPy.
+    Acepta también una matriz cuadrada o un memmap (ver Eduardo/distances.py);
+    con overwrite=True un vector float32 escribible (p. ej. un memmap abierto
+    con mode="c") se usa en el lugar, sin copiarlo. Si se pasa una MergeTrace,
+    se le agregan las uniones en el orden de la cadena.
+    """
+    d = _as_condensed(distances)
+    if not (overwrite and d.dtype == np.float32 and d.flags.writeable):
+        d = np.array(d, dtype=np.float32)
+    n = condensed_size(len(d))
+    labels = list(range(n)) if labels is None else list(labels)
+    if n == 0:
+        raise ValueError("Se necesita al menos un taxón.")
+
+    # Índices del vector condensado para leer la fila completa de un taxón
+    all_j = np.arange(n, dtype=np.int64)
+    def row_index(i):
+        lo = np.minimum(i, all_j)
+        hi = np.maximum(i, all_j)
+        idx = n * lo - lo * (lo + 1) // 2 + (hi - lo - 1)
+        idx[i] = 0
+        return idx
+
+    active = np.ones(n, dtype=bool)
+    size = np.ones(n, dtype=np.int64)
+    merges = []
+    rows = []  # filas antes/después de cada unión, solo si la traza las guarda
+    chain = []
+    remaining = n
+    while remaining > 1:
+        if not chain:
+            chain.append(int(np.flatnonzero(active)[0]))
+        a = chain[-1]
+        idx = row_index(a)
+        row = d[idx]
+        row[~active] = np.inf
+        row[a] = np.inf
+        b = int(np.argmin(row))
+        # En empate se prefiere el anterior de la cadena (garantiza terminar)
+        if len(chain) > 1 and row[chain[-2]] <= row[b]:
+            b = chain[-2]
+        if len(chain) > 1 and b == chain[-2]:
+            chain.pop()
+            chain.pop()
+            height = float(row[b])
+            # La unión queda en el menor índice; se promedian las filas ponderando tamaños
+            keep, drop = min(a, b), max(a, b)
+            keep_idx = row_index(keep)
+            drop_idx = row_index(drop)
+            mask = active.copy()
+            mask[keep] = mask[drop] = False
+            record = trace is not None and trace.record_rows
+            if record:
+                before = _trace_row(d[keep_idx], active)
+            total = size[keep] + size[drop]
+            d[keep_idx[mask]] = (size[keep] * d[keep_idx[mask]] + size[drop] * d[drop_idx[mask]]) / total
+            size[keep] = total
+            active[drop] = False
+            if record:
+                after = _trace_row(d[keep_idx], active)
+                before[keep] = after[keep] = 0
+                rows.append((before, after))
+            merges.append((keep, drop, height))
+            remaining -= 1
+        else:
+            chain.append(b)
+
+    tree, nodes = _tree_from_merges(n, labels, merges)
+    if trace is not None:
+        node_of = list(range(n))
+        for k, (keep, drop, distance) in enumerate(merges):
+            before, after = rows[k] if rows else (None, None)
+            trace.events.append(MergeEvent(keep, drop, node_of[keep], node_of[drop], nodes[k], distance, before, after))
+            node_of[keep] = nodes[k]
+    return tree
+
+def _tree_from_merges(n, labels, merges):
+    """Ordena las uniones por altura y asigna los ids de nodo (como scipy).
+
+    Devuelve el árbol y el nodo creado por cada unión, en el orden de merges.
+    """
+    order = sorted(range(len(merges)), key=lambda k: merges[k][2])
+    node_of = list(range(n))  # nodo actual que representa a cada ranura
+    children = []
+    heights = np.zeros(2 * n - 1)
+    lengths = np.zeros(2 * n - 1)
+    nodes = [0] * len(merges)
+    for k in order:
+        keep, drop, distance = merges[k]
+        a, b = node_of[keep], node_of[drop]
+        v = n + len(children)
+        children.append((a, b) if a < b else (b, a))
+        heights[v] = distance / 2
+        lengths[a] = heights[v] - heights[a]
+        lengths[b] = heights[v] - heights[b]
+        node_of[keep] = v
+        nodes[k] = v
+    return Tree(labels, children, lengths, heights), nodes
+
+def to_square(distances, dtype=np.float64):
+    """Matriz cuadrada simétrica a partir de un vector condensado (o una copia de la matriz)"""
+    distances = np.asarray(distances)
+    if distances.ndim == 2:
+        return distances.astype(dtype)
+    n = condensed_size(len(distances))
+    square = np.zeros((n, n), dtype=dtype)
+    start = 0
+    for i in range(n - 1):
+        row = distances[start:start + n - i - 1]
+        square[i, i + 1:] = row
+        square[i + 1:, i] = row
+        start += n - i - 1
+    return square
+
+
+def neighbor_joining(distances, labels=None, method="auto", prune_from=128, trace=None):
+    """Árbol aditivo por neighbor joining; devuelve un Tree con largos de rama.
+
+    Las sumas de fila r se mantienen y se actualizan en cada unión en vez de
+    recalcularse, y Q(i, j) = (m - 2)·d(i, j) - r(i) - r(j) se evalúa con
+    NumPy. method="pruned" usa la búsqueda acotada de RapidNJ (filas ordenadas
+    y cota con la mayor suma de fila); "auto" la usa desde prune_from taxones.
+    El árbol sin raíz se enraíza en el punto medio de la última unión. Si se
+    pasa una MergeTrace, se le agrega cada unión.
+
+    Memoria: NJ modifica filas arbitrarias, así que el vector condensado (o el
+    memmap) se copia a una matriz cuadrada float32 en RAM, 4·n² bytes (1.6 GB
+    con 20 000 taxones); las sumas de fila van en float64. La búsqueda acotada
+    guarda además las filas ordenadas (distancia float32 y nodo int32 por par),
+    otros ~4·n² bytes. El memmap evita la copia float64 de la entrada, no esta.
+    """
+    d = to_square(distances, np.float32)
+    n = len(d)
+    labels = list(range(n)) if labels is None else list(labels)
+    if n == 0:
+        raise ValueError("Se necesita al menos un taxón.")
+    if method == "auto":
+        method = "pruned" if n >= prune_from else "full"
+    if method not in ("full", "pruned"):
+        raise ValueError(f"Método desconocido: {method}")
+
+    active = np.ones(n, dtype=bool)
+    node_of = np.arange(n)  # nodo del árbol en cada ranura de la matriz
+    r = d.sum(axis=1, dtype=np.float64)
+    children = []
+    lengths = np.zeros(2 * n - 1)
+    search = _PrunedSearch(d, n) if method == "pruned" else None
+
+    m = n
+    while m > 2:
+        if search is None:
+            a, b = _full_search(d, r, active, m)
+        else:
+            a, b = search.find(r, active, m)
+        # Largos de las ramas hacia el nuevo nodo (se recortan a 0 si salen negativos)
+        la = 0.5 * d[a, b] + (r[a] - r[b]) / (2 * (m - 2))
+        lb = d[a, b] - la
+        v = n + len(children)
+        lengths[node_of[a]] = max(la, 0.0)
+        lengths[node_of[b]] = max(lb, 0.0)
+        children.append((int(node_of[a]), int(node_of[b])))
+
+        # El nuevo nodo ocupa la ranura a; r se corrige solo con las diferencias
+        new_row = 0.5 * (d[a] + d[b] - d[a, b])
+        before = None
+        if trace is not None and trace.record_rows:
+            before = _trace_row(d[a], active)
+        active[b] = False
+        new_row[~active] = 0
+        new_row[a] = 0
+        r += new_row - d[:, a] - d[:, b]
+        r[a] = new_row.sum()
+        r[~active] = 0
+        if trace is not None:
+            after = None if before is None else _trace_row(new_row, active)
+            trace.events.append(MergeEvent(a, b, int(node_of[a]), int(node_of[b]), v, float(d[a, b]), before, after))
+        d[a] = new_row
+        d[:, a] = new_row
+        if search is not None:
+            search.join(a, b, node_of[a], node_of[b], v, d, node_of, active)
+        node_of[a] = v
+        m -= 1
+
+    last = np.flatnonzero(active)
+    if len(last) == 2:
+        a, b = last
+        lengths[node_of[a]] = lengths[node_of[b]] = d[a, b] / 2
+        children.append((int(node_of[a]), int(node_of[b])))
+        if trace is not None:
+            trace.events.append(MergeEvent(a, b, int(node_of[a]), int(node_of[b]), n + len(children) - 1, float(d[a, b]), None, None))
+    return Tree(labels, children, lengths)
+
+def _full_search(d, r, active, m):
+    """Par activo de menor Q evaluando toda la submatriz activa"""
+    idx = np.flatnonzero(active)
+    q = (m - 2) * d[np.ix_(idx, idx)]
+    q -= r[idx, None]
+    q -= r[None, idx]
+    np.fill_diagonal(q, np.inf)
+    i, j = np.unravel_index(np.argmin(q), q.shape)
+    return idx[i], idx[j]
+
+
+class _PrunedSearch:
+    """Búsqueda acotada de RapidNJ.
+
+    Cada fila guarda sus distancias ordenadas junto al nodo del árbol al que
+    apuntan; un par de nodos vivos aparece en la fila del más reciente. Al
+    recorrer la fila i basta mirar las distancias menores que
+    (q_min + r(i) + max r) / (m - 2), y ese corte se obtiene con searchsorted.
+    """
+
+    def __init__(self, d, n):
+        self.slot_of = np.full(2 * n - 1, -1)  # ranura de cada nodo vivo, -1 si ya se unió
+        self.slot_of[:n] = np.arange(n)
+        self.rows = [None] * n
+        self.head = np.full(n, np.inf)  # menor distancia guardada en cada fila (cota inferior)
+        for i in range(n):
+            # Solo los j > i, así cada par queda en una única fila
+            self._set_row(i, d[i, i + 1:], np.arange(i + 1, n, dtype=np.int32))
+
+    def _set_row(self, slot, dist, nodes):
+        order = np.argsort(dist, kind="stable")
+        self.rows[slot] = (dist[order], nodes[order])
+        self.head[slot] = dist[order[0]] if len(dist) else np.inf
+
+    def join(self, a, b, old_a, old_b, node, d, node_of, active):
+        """Da de baja los nodos unidos y crea la fila ordenada del nuevo nodo en la ranura a"""
+        self.slot_of[old_a] = self.slot_of[old_b] = -1
+        self.slot_of[node] = a
+        self.rows[b] = None
+        self.head[b] = np.inf
+        others = np.flatnonzero(active)
+        others = others[others != a]
+        self._set_row(a, d[a, others], node_of[others].astype(np.int32))
+
+    def find(self, r, active, m):
+        max_r = r[active].max()
+        best_q, best_i, best_j = np.inf, -1, -1
+        # Cota de cada fila con su menor distancia: se recorren de la más
+        # prometedora a la menos y se corta cuando la cota supera el mejor Q
+        slots = np.flatnonzero(active)
+        bound = (m - 2) * self.head[slots] - r[slots] - max_r
+        order = np.argsort(bound, kind="stable")
+        for i, lower in zip(slots[order], bound[order]):
+            if lower > best_q:
+                break
+            dist, nodes = self.rows[i]
+            limit = len(dist)
+            if best_i >= 0:
+                limit = np.searchsorted(dist, (best_q + r[i] + max_r) / (m - 2), side="right")
+            if not limit:
+                continue
+            other = self.slot_of[nodes[:limit]]
+            alive = other >= 0
+            cand = dist[:limit][alive]
+            other = other[alive]
+            if len(other) < limit and 2 * len(other) < limit:
+                # Muchas entradas de nodos ya unidos: se compacta la fila
+                keep = self.slot_of[nodes] >= 0
+                self.rows[i] = (dist[keep], nodes[keep])
+                self.head[i] = dist[keep][0] if keep.any() else np.inf
+            if not len(other):
+                continue
+            q = (m - 2) * cand - r[i] - r[other]
+            k = int(np.argmin(q))
+            if q[k] < best_q:
+                best_q, best_i, best_j = q[k], i, other[k]
+        return best_i, best_j
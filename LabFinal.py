@@ -1,92 +1,146 @@
 import networkx as nx
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
 import numpy as np
-from itertools import combinations
-from matplotlib.animation import FuncAnimation
+from itertools import islice
 from Eduardo.Lab8 import TreeVisualizer
-from Waofin.Lab6_Waofin import generate_unique_permutations, compare_permutation_methods, generate_unique_combinations, compare_unique_combinations, transform_sequence
-
-# Definiciones de todas las funciones
-def is_vertex_cover(graph, subset):
-    for u, v in graph.edges():
-        if u not in subset and v not in subset:
-            return False
-    return True
-
-def brute_force_vertex_cover(graph):
-    nodes = list(graph.nodes())
-    for k in range(1, len(nodes) + 1):
-        for subset in combinations(nodes, k):
-            if is_vertex_cover(graph, subset):
-                return subset
-    return None
-
-def greedy_vertex_cover(graph):
-    cover = set()
-    edges = set(graph.edges())
-    while edges:
-        degrees = {node: len(list(graph.neighbors(node))) for node in graph.nodes}
-        max_degree_node = max(degrees, key=degrees.get)
-        cover.add(max_degree_node)
-        for neighbor in list(graph.neighbors(max_degree_node)):
-            edges.discard((max_degree_node, neighbor))
-            edges.discard((neighbor, max_degree_node))
-        graph.remove_node(max_degree_node)
-    return cover
-
-def visualizar_progreso(realidad, deseo, paso):
-    plt.figure(figsize=(10, 5))
-    plt.bar(range(len(realidad)), realidad, color='lightblue', label='Realidad')
-    plt.plot(range(len(deseo)), deseo, color='orange', marker='o', linestyle='-', label='Deseo')
-    plt.title(f"Paso {paso}: Reordenamiento de la Secuencia")
-    plt.xlabel("Índice")
-    plt.ylabel("Valor")
-    plt.legend()
-    plt.show()
-
-def bubble_sort_visual(realidad, deseo):
-    n = len(realidad)
-    pasos = 0
-    for i in range(n):
-        for j in range(0, n-i-1):
-            if realidad[j] > realidad[j+1]:
-                realidad[j], realidad[j+1] = realidad[j+1], realidad[j]
-                pasos += 1
-        visualizar_progreso(realidad, deseo, pasos)
-    return realidad
-
-def visualizar_circular(realidad, deseo, paso):
-    n = len(realidad)
-    angulos = np.linspace(0, 2 * np.pi, n, endpoint=False)
-    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw={'projection': 'polar'})
-    ax.set_theta_direction(-1)
-    ax.set_theta_offset(np.pi / 2)
-    ax.scatter(angulos, deseo, color="orange", label="Deseo", s=100, alpha=0.7)
-    ax.scatter(angulos, realidad, color="blue", label="Realidad", s=100)
-    for i in range(n):
-        ax.plot([angulos[i], angulos[i]], [realidad[i], deseo[i]], 
-                color="gray", linestyle="--", alpha=0.5)
-    plt.title(f"Paso {paso}: Estado de la Secuencia", va="bottom")
-    ax.legend(loc="upper right")
-    plt.show()
-
-def bubble_sort_circular(realidad, deseo):
-    n = len(realidad)
-    pasos = 0
-    for i in range(n):
-        for j in range(0, n-i-1):
-            if realidad[j] > realidad[j+1]:
-                realidad[j], realidad[j+1] = realidad[j+1], realidad[j]
-                pasos += 1
-                visualizar_circular(realidad, deseo, pasos)
-    return realidad
-
+from Waofin.Lab6_Waofin import compare_permutation_methods, compare_unique_combinations, transform_sequence
+from Waofin.Lab6_Waofin import count_unique_permutations, iter_unique_permutations, count_unique_combinations, iter_unique_combinations
+from vertex_cover import greedy_vertex_cover, parallel_vertex_cover
+from jobs import JobExecutor
+from sorting import SORTS
+from ppi_networks import MODELS
+
+
+class SortStepViewer:
+    """Una figura y un canvas por ejecución; cada paso solo actualiza los artistas animados.
+
+    El fondo (ejes, curva deseada, leyenda) se guarda tras cada redibujado
+    completo y en cada paso se restaura y se pintan encima las barras (o los
+    puntos en la vista circular) con blitting. Con muchos elementos las barras
+    se dibujan como una sola colección de líneas verticales.
+    """
+
+    MAX_BARS = 300
+
+    def __init__(self, master, deseo, circular=False):
+        deseo = np.asarray(deseo)
+        n = len(deseo)
+        self.circular = circular
+        self.fig = Figure(figsize=(10, 5) if not circular else (8, 8))
+        self.background = None
+        if circular:
+            ax = self.fig.add_subplot(projection='polar')
+            ax.set_theta_direction(-1)
+            ax.set_theta_offset(np.pi / 2)
+            self.angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+            self.deseo = deseo
+            ax.scatter(self.angles, deseo, color="orange", label="Deseo", s=100, alpha=0.7)
+            self.points = ax.scatter(self.angles, deseo, color="blue", label="Realidad", s=100, animated=True)
+            self.links = LineCollection([], colors="gray", linestyles="--", alpha=0.5, animated=True)
+            ax.add_collection(self.links)
+            ax.set_ylim(0, deseo.max() * 1.05 if n else 1)
+            ax.legend(loc="upper right")
+            self.artists = [self.links, self.points]
+        else:
+            ax = self.fig.add_subplot()
+            if n <= self.MAX_BARS:
+                self.bars = ax.bar(range(n), deseo, color='lightblue', label='Realidad', animated=True)
+                self.artists = list(self.bars)
+            else:
+                self.bars = None
+                self.lines = LineCollection([], colors='lightblue', label='Realidad', animated=True)
+                ax.add_collection(self.lines)
+                self.artists = [self.lines]
+            ax.plot(range(n), deseo, color='orange', marker='o' if n <= self.MAX_BARS else None, linestyle='-', label='Deseo')
+            ax.set_xlim(-1, n)
+            ax.set_ylim(0, deseo.max() * 1.05 if n else 1)
+            ax.set_xlabel("Índice")
+            ax.set_ylabel("Valor")
+            ax.legend()
+        self.ax = ax
+        self.title = ax.set_title("", animated=True)
+        self.artists.append(self.title)
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+
+    def _on_draw(self, event):
+        # Tras un redibujado completo (primera vez, cambio de tamaño) se guarda el fondo
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def show(self, realidad, paso):
+        realidad = np.asarray(realidad)
+        if self.circular:
+            self.points.set_offsets(np.column_stack([self.angles, realidad]))
+            self.links.set_segments(np.stack([np.column_stack([self.angles, realidad]),
+                                              np.column_stack([self.angles, self.deseo])], axis=1))
+            self.title.set_text(f"Paso {paso}: Estado de la Secuencia")
+        else:
+            if self.bars is not None:
+                for bar, height in zip(self.bars, realidad):
+                    bar.set_height(height)
+            else:
+                x = np.arange(len(realidad))
+                self.lines.set_segments(np.stack([np.column_stack([x, np.zeros(len(x))]),
+                                                  np.column_stack([x, realidad])], axis=1))
+            self.title.set_text(f"Paso {paso}: Reordenamiento de la Secuencia")
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.fig.bbox)
+
+    def destroy(self):
+        self.canvas.get_tk_widget().destroy()
+
+
+# Trabajos en segundo plano (ver jobs.py): reciben el job y devuelven el resultado
+def _job_vertex_cover(job, nodes, edges, exact):
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+    job.report(f"Buscando vertex cover en {G.number_of_nodes()} nodos y {G.number_of_edges()} aristas...")
+    cover = parallel_vertex_cover(G, check=job.check) if exact else greedy_vertex_cover(G)
+    return G, cover
+
+def _job_permutations(job, elements):
+    # El total y las primeras salen al instante; los tiempos después
+    job.report(f"Permutaciones únicas encontradas: {count_unique_permutations(elements)}")
+    job.report(f"Primeras 5 permutaciones: {list(islice(iter_unique_permutations(elements), 5))}")
+    job.check()
+    return compare_permutation_methods(elements, check=job.check)
+
+def _job_combinations(job, elements, r):
+    job.report(f"Número de combinaciones únicas: {count_unique_combinations(elements, r)}")
+    job.report(f"Primeras 5 combinaciones: {list(islice(iter_unique_combinations(elements, r), 5))}")
+    job.check()
+    return compare_unique_combinations(elements, r, check=job.check)
+
+def _job_transform(job, start, target):
+    steps = transform_sequence(start, target)
+    lines = []
+    for k, (step, description) in enumerate(steps):
+        if k % 1000 == 0:
+            job.check()
+        lines.append(f"{description}: {step}")
+    return lines
 
 
 class GraphVisualizer:
+    MAX_DRAWN_NODES = 200  # redes más grandes solo se resumen
+
     def __init__(self, root):
         self.root = root
         self.root.title("Visualizador de Algoritmos")
@@ -122,9 +176,14 @@ class GraphVisualizer:
         self.params_frame = ttk.LabelFrame(self.main_frame, text="Parámetros")
         self.params_frame.pack(fill='x', pady=10, padx=5)
         
-        # Botón para ejecutar
-        self.run_button = ttk.Button(self.main_frame, text="Ejecutar", command=self.run_algorithm)
-        self.run_button.pack(pady=10)
+        # Botones para ejecutar y detener
+        frame_buttons = ttk.Frame(self.main_frame)
+        frame_buttons.pack(pady=10)
+        self.run_button = ttk.Button(frame_buttons, text="Ejecutar", command=self.run_algorithm)
+        self.run_button.pack(side='left', padx=5)
+        self.stop_button = ttk.Button(frame_buttons, text="Detener", command=self.stop_algorithm, state='disabled')
+        self.stop_button.pack(side='left', padx=5)
+        self.jobs = JobExecutor(self.root)
         
         # Área de resultados (oculta inicialmente)
         self.visual_frame = ttk.Frame(self.main_frame)
@@ -142,9 +201,10 @@ class GraphVisualizer:
         self.algorithm_type.bind('<<ComboboxSelected>>', self.update_params)
 
         # Variables para visualización de ordenamiento
-        self.sort_steps = []
+        self.sort_trace = None
         self.current_step = 0
-        self.canvas = None
+        self.sort_viewer = None
+        self.ppi_graph = None
     
     def setup_ppi_params(self):
         for widget in self.params_frame.winfo_children():
@@ -157,6 +217,14 @@ class GraphVisualizer:
         ttk.Label(frame, text="Número de nodos:").pack(side='left')
         ttk.Entry(frame, textvariable=self.num_nodes, width=10).pack(side='left', padx=(10, 0))
 
+        self.ppi_model = tk.StringVar(value="duplication_divergence")
+        ttk.Label(frame, text="Modelo:").pack(side='left', padx=(10, 0))
+        ttk.Combobox(frame, textvariable=self.ppi_model, values=list(MODELS), state='readonly', width=22).pack(side='left', padx=(10, 0))
+
+        self.ppi_seed = tk.StringVar(value="0")
+        ttk.Label(frame, text="Semilla:").pack(side='left', padx=(10, 0))
+        ttk.Entry(frame, textvariable=self.ppi_seed, width=8).pack(side='left', padx=(10, 0))
+
     def setup_vertex_cover_params(self):
         for widget in self.params_frame.winfo_children():
             widget.destroy()
@@ -184,6 +252,10 @@ class GraphVisualizer:
         ttk.Label(frame, text="Longitud de la secuencia:").pack(side='left')
         ttk.Entry(frame, textvariable=self.sequence_length, width=10).pack(side='left', padx=(10, 0))
 
+        self.sort_method = tk.StringVar(value="bubble")
+        ttk.Label(frame, text="Algoritmo:").pack(side='left', padx=(10, 0))
+        ttk.Combobox(frame, textvariable=self.sort_method, values=list(SORTS), state='readonly', width=10).pack(side='left', padx=(10, 0))
+
     def setup_permutation_params(self):
         for widget in self.params_frame.winfo_children():
             widget.destroy()
@@ -243,13 +315,46 @@ class GraphVisualizer:
         elif "Transformación de Secuencia" in algorithm:
             self.setup_sequence_params()
 
+    def save_ppi_edges(self):
+        path = filedialog.asksaveasfilename(defaultextension=".npz", filetypes=[("Lista de aristas", "*.npz")])
+        if path:
+            self.ppi_graph.save(path)
+
     def append_to_results(self, message):
         self.results_text.configure(state='normal')
         self.results_text.insert('end', message + '\n')
         self.results_text.configure(state='disabled')
 
+    def start_job(self, func, *args, on_done, process=False):
+        """Corre func en segundo plano; sus avances se agregan a los resultados"""
+        self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
+        self.stop_button.configure(state='normal')
+
+        def finish(callback):
+            def handler(*values):
+                self.stop_button.configure(state='disabled')
+                callback(*values)
+            return handler
+
+        self.jobs.start(
+            func, *args,
+            on_done=finish(on_done),
+            on_progress=lambda message, partial: message and self.append_to_results(message),
+            on_error=finish(lambda message, details: self.append_to_results(f"Error: {message}")),
+            on_cancel=finish(lambda: self.append_to_results("Ejecución detenida.")),
+            process=process,
+        )
+
+    def stop_algorithm(self):
+        self.jobs.stop()
+
     def run_algorithm(self):
         algorithm = self.algorithm_type.get()
+        if self.jobs.busy:
+            # No se lanza un trabajo encima de otro
+            self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
+            self.append_to_results("Ya hay un algoritmo en ejecución: deténgalo o espere a que termine.")
+            return
         self.results_text.configure(state='normal')
         self.results_text.delete(1.0, 'end')  # Limpiar resultados previos
         self.results_text.configure(state='disabled')
@@ -258,139 +363,137 @@ class GraphVisualizer:
         self.results_frame.pack_forget()
         
         if "PPI Network" in algorithm:
-            # Crear y mostrar grafo PPI
-            ppi_graph = nx.Graph()
+            # Generar la red con el modelo elegido (ver ppi_networks.py)
             n = int(self.num_nodes.get())
-            nodes = [f"P{i}" for i in range(1, n+1)]
-            ppi_graph.add_nodes_from(nodes)
-            # Agregar algunas aristas aleatorias
-            for i in range(n-1):
-                ppi_graph.add_edge(nodes[i], nodes[i+1])
-            plt.figure()  # Crear nueva figura
-            nx.draw(ppi_graph, with_labels=True, node_color="lightblue", edge_color="gray")
-            plt.show()
-            
-        elif "Vertex Cover - Brute Force" in algorithm:
-            # Mostrar tabla de resultados
-            self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
-            
-            # Calcular Vertex Cover usando fuerza bruta
-            G = nx.Graph()
-            nodes = self.nodes_input.get().split(',')
-            edges = [tuple(edge.split(',')) for edge in self.edges_input.get().split(';')]
-            G.add_nodes_from(nodes)
-            G.add_edges_from(edges)
-            cover = brute_force_vertex_cover(G)
-            self.append_to_results(f"Vertex Cover (Brute Force): {cover}")
-            plt.figure()  # Crear nueva figura
-            nx.draw(G, with_labels=True)
-            plt.show()
-            
-        elif "Vertex Cover - Greedy" in algorithm:
-            # Mostrar tabla de resultados
-            self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
-            
-            # Calcular Vertex Cover usando Greedy
-            G = nx.Graph()
+            model = self.ppi_model.get()
+            seed = int(self.ppi_seed.get())
+
+            def show_network(graph):
+                degree = graph.degree()
+                self.append_to_results(f"Red PPI ({model}): {graph.number_of_nodes()} nodos, "
+                                       f"{graph.number_of_edges()} aristas, grado medio "
+                                       f"{degree.mean() if len(degree) else 0:.2f}, máximo {degree.max(initial=0)}")
+                for widget in self.visual_frame.winfo_children():
+                    widget.destroy()
+                self.ppi_graph = graph
+                ttk.Button(self.visual_frame, text="Guardar lista de aristas...", command=self.save_ppi_edges).pack(pady=5)
+                if n <= self.MAX_DRAWN_NODES:
+                    ppi_graph = nx.relabel_nodes(graph.to_networkx(), lambda i: f"P{i + 1}")
+                    plt.figure()  # Crear nueva figura
+                    nx.draw(ppi_graph, with_labels=True, node_color="lightblue", edge_color="gray")
+                    plt.show()
+                else:
+                    self.append_to_results("Red demasiado grande para dibujarla.")
+
+            self.start_job(lambda job: MODELS[model](n, seed=seed), on_done=show_network)
+
+        elif "Vertex Cover" in algorithm:
             nodes = self.nodes_input.get().split(',')
             edges = [tuple(edge.split(',')) for edge in self.edges_input.get().split(';')]
-            G.add_nodes_from(nodes)
-            G.add_edges_from(edges)
-            cover = greedy_vertex_cover(G.copy())
-            self.append_to_results(f"Vertex Cover (Greedy): {cover}")
-            plt.figure()  # Crear nueva figura
-            nx.draw(G, with_labels=True)
-            plt.show()
-            
-        elif "Ordenamiento - Visualización Normal" in algorithm:
-            n = int(self.sequence_length.get())
-            realidad = list(np.random.permutation(n) + 1)
-            deseo = sorted(realidad)
-            self.sort_steps = self.bubble_sort_steps(realidad.copy(), deseo)
-            self.current_step = 0
-            self.show_sort_step()
+            exact = "Brute Force" in algorithm
+            label = "Brute Force" if exact else "Greedy"
+
+            def show_cover(result):
+                G, cover = result
+                self.append_to_results(f"Vertex Cover ({label}): {cover}")
+                plt.figure()  # Crear nueva figura
+                nx.draw(G, with_labels=True)
+                plt.show()
 
-            # Botones para navegar entre pasos
-            self.prev_button = ttk.Button(self.visual_frame, text="Anterior", command=self.prev_step)
-            self.prev_button.pack(side='left', padx=10)
-            self.next_button = ttk.Button(self.visual_frame, text="Siguiente", command=self.next_step)
-            self.next_button.pack(side='left', padx=10)
+            # La búsqueda exacta reparte su árbol en un pool de procesos desde el hilo del trabajo
+            self.start_job(_job_vertex_cover, nodes, edges, exact, on_done=show_cover)
 
-        elif "Ordenamiento - Visualización Circular" in algorithm:
+        elif "Ordenamiento" in algorithm:
             n = int(self.sequence_length.get())
-            realidad = list(np.random.permutation(n) + 1)
+            realidad = (np.random.permutation(n) + 1).tolist()
             deseo = sorted(realidad)
-            bubble_sort_circular(realidad.copy(), deseo)
+            circular = "Circular" in algorithm
+            method = self.sort_method.get()
+
+            def show_sort(trace):
+                # Una sola figura por ejecución; se descarta la vista anterior
+                for widget in self.visual_frame.winfo_children():
+                    widget.destroy()
+                self.sort_trace = trace
+                self.current_step = 0
+                self.sort_viewer = SortStepViewer(self.visual_frame, deseo, circular=circular)
+
+                # Botones para navegar entre pasos y barra para saltar a cualquiera
+                self.prev_button = ttk.Button(self.visual_frame, text="Anterior", command=self.prev_step)
+                self.prev_button.pack(side='left', padx=10)
+                self.next_button = ttk.Button(self.visual_frame, text="Siguiente", command=self.next_step)
+                self.next_button.pack(side='left', padx=10)
+                self.step_scale = ttk.Scale(self.visual_frame, from_=0, to=len(trace), command=self.scrub_step)
+                self.step_scale.pack(side='left', fill='x', expand=True, padx=10)
+                self.show_sort_step()
+
+                counters = trace.counters()
+                self.append_to_results(f"Ordenamiento ({method}): {counters['steps']} pasos, "
+                                       f"{counters['comparisons']} comparaciones, {counters['swaps']} intercambios, "
+                                       f"{counters['moves']} movimientos, {counters['reversals']} reversiones")
+
+            self.start_job(lambda job: SORTS[method](realidad, check=job.check), on_done=show_sort)
     
         elif "Visualizacón - Arboles" in algorithm:
             # Crear y mostrar árboles ultramétricos y aditivos
-            tree = TreeVisualizer(self.root)
+            tree = TreeVisualizer(self.root, self.jobs)
             tree.create_main_menu()
 
         elif "Permutaciones Únicas" in algorithm:
             elements = self.permutation_input.get().split(',')
-            n_perms, t_unique, t_itertools, itertools_results = compare_permutation_methods(elements)
-            
-            # Mostrar resultados
-            self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
-            self.append_to_results(f"Permutaciones únicas encontradas: {n_perms}")
-            self.append_to_results(f"Tiempo (Implementación Única): {t_unique:.6f} segundos")
-            self.append_to_results(f"Tiempo (itertools): {t_itertools:.6f} segundos")
-            self.append_to_results(f"Primeras 5 permutaciones: {list(itertools_results)[:5]}")
+
+            def show_permutation_times(result):
+                n_perms, t_unique, t_itertools, first_results = result
+                if t_unique is None:
+                    self.append_to_results("Tiempo (Implementación Única): omitido, demasiadas permutaciones")
+                else:
+                    self.append_to_results(f"Tiempo (Implementación Única): {t_unique:.6f} segundos")
+                if t_itertools is None:
+                    self.append_to_results("Tiempo (itertools): omitido, demasiados elementos")
+                else:
+                    self.append_to_results(f"Tiempo (itertools): {t_itertools:.6f} segundos")
+
+            self.start_job(_job_permutations, elements, on_done=show_permutation_times)
 
         elif "Combinaciones Únicas" in algorithm:
             elements = self.combination_input.get().split(',')
             r = self.combination_r.get()
-            n_combinations, t_combinations, combinations_list = compare_unique_combinations(elements, r)
-            
-            # Mostrar resultados
-            self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
-            self.append_to_results(f"Número de combinaciones únicas: {n_combinations}")
-            self.append_to_results(f"Tiempo de ejecución: {t_combinations:.6f} segundos")
-            self.append_to_results(f"Primeras 5 combinaciones: {list(combinations_list)[:5]}")
+
+            def show_combination_time(result):
+                n_combinations, t_combinations, first_results = result
+                if t_combinations is None:
+                    self.append_to_results("Tiempo de ejecución: omitido, demasiadas combinaciones")
+                else:
+                    self.append_to_results(f"Tiempo de ejecución: {t_combinations:.6f} segundos")
+
+            self.start_job(_job_combinations, elements, r, on_done=show_combination_time)
 
         elif "Transformación de Secuencia" in algorithm:
             start = self.start_sequence.get().split(',')
             target = self.target_sequence.get().split(',')
             
             if len(start) != len(target):
+                self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
                 self.append_to_results("Error: Las secuencias deben tener la misma longitud.")
             else:
-                steps = transform_sequence(start, target)
-                self.results_frame.pack(fill='both', expand=True, pady=10, padx=5)
-                for step, description in steps:
-                    self.append_to_results(f"{description}: {step}")
-                self.append_to_results(f"Total pasos: {len(steps)}")
-
-    def bubble_sort_steps(self, realidad, deseo):
-        steps = []
-        n = len(realidad)
-        pasos = 0
-        for i in range(n):
-            for j in range(0, n-i-1):
-                if realidad[j] > realidad[j+1]:
-                    realidad[j], realidad[j+1] = realidad[j+1], realidad[j]
-                    pasos += 1
-                    steps.append((realidad.copy(), deseo.copy(), pasos))
-        return steps
-
-    def show_sort_step(self):
-        if self.sort_steps:
-            realidad, deseo, paso = self.sort_steps[self.current_step]
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.bar(range(len(realidad)), realidad, color='lightblue', label='Realidad')
-            ax.plot(range(len(deseo)), deseo, color='orange', marker='o', linestyle='-', label='Deseo')
-            ax.set_title(f"Paso {paso}: Reordenamiento de la Secuencia")
-            ax.set_xlabel("Índice")
-            ax.set_ylabel("Valor")
-            ax.legend()
+                def show_steps(lines):
+                    for line in lines:
+                        self.append_to_results(line)
+                    self.append_to_results(f"Total pasos: {len(lines)}")
 
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
+                self.start_job(_job_transform, start, target, on_done=show_steps)
 
-            self.canvas = FigureCanvasTkAgg(fig, master=self.visual_frame)
-            self.canvas.draw()
-            self.canvas.get_tk_widget().pack(fill='both', expand=True)
+    def show_sort_step(self):
+        if self.sort_trace is not None:
+            realidad = self.sort_trace.state(self.current_step)
+            self.sort_viewer.show(realidad, self.current_step)
+            self.step_scale.set(self.current_step)
+
+    def scrub_step(self, value):
+        step = int(float(value))
+        if self.sort_trace is not None and step != self.current_step:
+            self.current_step = step
+            self.show_sort_step()
 
     def prev_step(self):
         if self.current_step > 0:
@@ -398,7 +501,7 @@ class GraphVisualizer:
             self.show_sort_step()
 
     def next_step(self):
-        if self.current_step < len(self.sort_steps) - 1:
+        if self.sort_trace is not None and self.current_step < len(self.sort_trace):
             self.current_step += 1
             self.show_sort_step()
 
@@ -1,51 +1,280 @@
-import time
-from itertools import permutations, combinations
+from collections import Counter
+from itertools import permutations, islice
+from math import factorial
+
+from Waofin.benchmark import benchmark, consume
+from Waofin.reversals import Genome, reversal_sequence
+
+_END = object()
+
+def _drain(iterable, sink, check=None, every=1 << 16):
+    """Pasa el iterable a sink en bloques de `every` elementos, llamando a check() antes de cada bloque"""
+    it = iter(iterable)
+    while True:
+        if check is not None:
+            check()  # Permite detener la medición
+        sink(islice(it, every))
+        item = next(it, _END)
+        if item is _END:
+            return
+        sink((item,))
+
+def iter_unique_permutations(elements):
+    """Genera cada permutación distinta una sola vez, en orden lexicográfico (algoritmo L de Knuth)"""
+    a = sorted(elements)
+    n = len(a)
+    while True:
+        yield tuple(a)
+        # Mayor j con a[j] < a[j+1]; si no existe, era la última permutación
+        j = n - 2
+        while j >= 0 and a[j] >= a[j + 1]:
+            j -= 1
+        if j < 0:
+            return
+        # Mayor l con a[j] < a[l], intercambiar e invertir el sufijo
+        l = n - 1
+        while a[j] >= a[l]:
+            l -= 1
+        a[j], a[l] = a[l], a[j]
+        a[j + 1:] = a[:j:-1]
 
 def generate_unique_permutations(elements):
     """Genera todas las permutaciones únicas de una lista de elementos"""
-    def backtrack(path, options):
-        if not options:
-            results.add(tuple(path))
-            return
-        seen = set()
-        for i in range(len(options)):
-            if options[i] not in seen:
-                seen.add(options[i])
-                backtrack(path + [options[i]], options[:i] + options[i+1:])
+    return list(iter_unique_permutations(elements))
+
+def compare_permutation_methods(elements, first=5, max_itertools=10, max_enumerate=2_000_000, repeat=1, warmup=0,
+                                check=None):
+    """Compara el rendimiento entre implementaciones de permutaciones únicas.
+
+    El total se calcula con la fórmula multinomial. Los tiempos son la mediana
+    de `repeat` corridas tras `warmup` de calentamiento (ver Waofin/benchmark.py);
+    por defecto una sola corrida, que es lo que necesita la interfaz. La
+    implementación propia se recorre en streaming solo si hay a lo sumo
+    max_enumerate permutaciones; itertools necesita un set con todas, así que
+    solo se mide hasta max_itertools elementos. Un tiempo no medido se devuelve
+    como None. Si se da `check`, se llama en cada corrida y cada 65536
+    permutaciones.
+    """
+    n_perms = count_unique_permutations(elements)
+    first_results = list(islice(iter_unique_permutations(elements), first))
+
+    time_unique = None
+    if n_perms <= max_enumerate:
+        stats = benchmark(lambda: _drain(iter_unique_permutations(elements), consume, check), warmup=warmup, repeat=repeat, measure_memory=False)
+        time_unique = stats["median_ns"] / 1e9
+
+    time_itertools = None
+    if len(elements) <= max_itertools:
+        stats = benchmark(lambda: _drain(permutations(elements), set().update, check), warmup=warmup, repeat=repeat, measure_memory=False)
+        time_itertools = stats["median_ns"] / 1e9
+
+    return n_perms, time_unique, time_itertools, first_results
+
+def _value_counts(elements):
+    """Valores distintos ordenados y cuántas veces aparece cada uno"""
+    counts = Counter(elements)
+    values = sorted(counts)
+    return values, [counts[v] for v in values]
+
+def count_unique_permutations(elements):
+    """Número de permutaciones únicas (multinomial n! / (c1!·c2!·...)) sin enumerarlas"""
+    total = factorial(len(elements))
+    for c in Counter(elements).values():
+        total //= factorial(c)
+    return total
+
+def rank_unique_permutation(permutation):
+    """Posición (desde 0) de la permutación en el orden lexicográfico de sus permutaciones únicas"""
+    values, counts = _value_counts(permutation)
+    remaining = count_unique_permutations(permutation)
+    n = len(permutation)
+    rank = 0
+    for item in permutation:
+        # remaining * c / n permutaciones empiezan con un valor de conteo c
+        for j, v in enumerate(values):
+            if v == item:
+                remaining = remaining * counts[j] // n
+                counts[j] -= 1
+                break
+            if counts[j]:
+                rank += remaining * counts[j] // n
+        n -= 1
+    return rank
+
+def unrank_unique_permutation(elements, k):
+    """k-ésima permutación única (desde 0) en orden lexicográfico, sin generar las anteriores"""
+    values, counts = _value_counts(elements)
+    remaining = count_unique_permutations(elements)
+    if not 0 <= k < remaining:
+        raise IndexError("Índice fuera del rango de permutaciones únicas")
+    n = len(elements)
+    result = []
+    for _ in range(len(elements)):
+        for j, v in enumerate(values):
+            if not counts[j]:
+                continue
+            block = remaining * counts[j] // n
+            if k < block:
+                result.append(v)
+                remaining = block
+                counts[j] -= 1
+                break
+            k -= block
+        n -= 1
+    return tuple(result)
 
-    results = set()
-    backtrack([], elements)
-    return list(results)
+def _combination_table(counts, r):
+    """suffix[j][s]: combinaciones de tamaño s usando solo los valores j, j+1, ..."""
+    suffix = [[0] * (r + 1) for _ in range(len(counts) + 1)]
+    suffix[len(counts)][0] = 1
+    for j in range(len(counts) - 1, -1, -1):
+        for s in range(r + 1):
+            suffix[j][s] = sum(suffix[j + 1][s - t] for t in range(min(counts[j], s) + 1))
+    return suffix
 
-def compare_permutation_methods(elements):
-    """Compara el rendimiento entre implementaciones de permutaciones únicas"""
-    start_unique = time.time()
-    unique_results = generate_unique_permutations(elements)
-    time_unique = time.time() - start_unique
+def _combinations_from(suffix, j, available, size):
+    """Combinaciones de tamaño size con valores >= j, quedando `available` copias del valor j"""
+    return sum(suffix[j + 1][size - t] for t in range(min(available, size) + 1))
 
-    start_itertools = time.time()
-    itertools_results = list(set(permutations(elements)))
-    time_itertools = time.time() - start_itertools
+def count_unique_combinations(elements, r):
+    """Número de combinaciones únicas de tamaño r de un multiconjunto sin enumerarlas"""
+    if r < 0:
+        return 0
+    values, counts = _value_counts(elements)
+    return _combination_table(counts, r)[0][r]
 
-    return len(unique_results), time_unique, time_itertools, itertools_results
+def rank_unique_combination(elements, combination):
+    """Posición (desde 0) de la combinación en el orden de sus combinaciones únicas ordenadas"""
+    values, counts = _value_counts(elements)
+    r = len(combination)
+    suffix = _combination_table(counts, r)
+    rank = 0
+    start = 0
+    for pos, item in enumerate(sorted(combination)):
+        for j in range(start, len(values)):
+            if counts[j] and values[j] == item:
+                counts[j] -= 1
+                start = j
+                break
+            if counts[j]:
+                rank += _combinations_from(suffix, j, counts[j] - 1, r - pos - 1)
+        else:
+            raise ValueError("La combinación no pertenece a los elementos dados")
+    return rank
+
+def unrank_unique_combination(elements, r, k):
+    """k-ésima combinación única (desde 0) de tamaño r, en orden lexicográfico"""
+    values, counts = _value_counts(elements)
+    suffix = _combination_table(counts, max(r, 0))
+    if r < 0 or not 0 <= k < suffix[0][r]:
+        raise IndexError("Índice fuera del rango de combinaciones únicas")
+    result = []
+    start = 0
+    for pos in range(r):
+        for j in range(start, len(values)):
+            if not counts[j]:
+                continue
+            block = _combinations_from(suffix, j, counts[j] - 1, r - pos - 1)
+            if k < block:
+                result.append(values[j])
+                counts[j] -= 1
+                start = j
+                break
+            k -= block
+    return tuple(result)
+
+def iter_unique_combinations(elements, r):
+    """Genera cada combinación distinta de tamaño r una sola vez, en orden lexicográfico.
+
+    Trabaja sobre los conteos de cada valor: nunca produce duplicados y poda
+    las ramas en las que ya no quedan suficientes elementos.
+    """
+    values, counts = _value_counts(elements)
+    if r < 0 or r > len(elements):
+        return
+    # capacity[j]: elementos disponibles con valores j, j+1, ... (sin usar)
+    capacity = [0] * (len(values) + 1)
+    for j in range(len(values) - 1, -1, -1):
+        capacity[j] = capacity[j + 1] + counts[j]
+    prefix = []
+
+    def extend(start, size):
+        if size == 0:
+            yield tuple(prefix)
+            return
+        for j in range(start, len(values)):
+            if counts[j] + capacity[j + 1] < size:
+                return
+            if not counts[j]:
+                continue
+            counts[j] -= 1
+            prefix.append(values[j])
+            yield from extend(j, size - 1)
+            prefix.pop()
+            counts[j] += 1
+
+    yield from extend(0, r)
 
 def generate_unique_combinations(elements, r):
     """Genera combinaciones únicas de tamaño r"""
-    return list(set(combinations(sorted(elements), r)))
+    return list(iter_unique_combinations(elements, r))
+
+def compare_unique_combinations(elements, r, first=5, max_enumerate=2_000_000, repeat=1, warmup=0, check=None):
+    """Calcula el número de combinaciones únicas y su tiempo de ejecución.
+
+    El total sale de la fórmula. El tiempo es la mediana de `repeat` recorridos
+    completos en streaming tras `warmup` de calentamiento (ver
+    Waofin/benchmark.py); por defecto uno solo, que es lo que necesita la
+    interfaz. Solo se mide si hay a lo sumo max_enumerate combinaciones; si no,
+    se devuelve None. Si se da `check`, se llama en cada corrida y cada 65536
+    combinaciones.
+    """
+    n_combinations = count_unique_combinations(elements, r)
+    first_results = list(islice(iter_unique_combinations(elements, r), first))
 
-def compare_unique_combinations(elements, r):
-    """Calcula el número de combinaciones únicas y su tiempo de ejecución"""
-    start_combinations = time.time()
-    unique_combinations = generate_unique_combinations(elements, r)
-    time_combinations = time.time() - start_combinations
-    return len(unique_combinations), time_combinations, unique_combinations
+    time_combinations = None
+    if n_combinations <= max_enumerate:
+        stats = benchmark(lambda: _drain(iter_unique_combinations(elements, r), consume, check), warmup=warmup, repeat=repeat, measure_memory=False)
+        time_combinations = stats["median_ns"] / 1e9
+    return n_combinations, time_combinations, first_results
+
+class _ReversalSteps:
+    """Pasos (estado, descripción) de un Genome; los estados se rehacen al recorrerlos"""
+
+    def __init__(self, genome):
+        self.genome = genome
+
+    def __len__(self):
+        return len(self.genome.operations)
+
+    def __getitem__(self, k):
+        i, j = self.genome.operations[k]
+        return self.genome.state(k + 1), f"Invertir posiciones {i + 1}-{j + 1}"
+
+    def __iter__(self):
+        for (i, j), state in zip(self.genome.operations, self.genome.states()):
+            yield state, f"Invertir posiciones {i + 1}-{j + 1}"
 
 def transform_sequence(start, target):
-    """Realiza una transformación paso a paso desde una secuencia inicial hasta una objetivo"""
-    steps = []
-    current = list(start)
-    for i in range(len(current)):
-        if current[i] != target[i]:
-            steps.append((current.copy(), f"Intercambiar {current[i]} con {target[i]}"))
-            current[i] = target[i]
-    return steps
+    """Realiza una transformación paso a paso desde una secuencia inicial hasta una objetivo.
+
+    Si ambas son permutaciones con signo de los mismos genes (enteros), usa el
+    mínimo número de inversiones (ver Waofin/reversals.py) y devuelve los pasos
+    sin copiar la secuencia en cada uno; si no, reemplaza elemento por elemento.
+    """
+    try:
+        genes = [int(x) for x in start]
+        reversals = reversal_sequence(genes, [int(x) for x in target])
+    except ValueError:
+        steps = []
+        current = list(start)
+        for i in range(len(current)):
+            if current[i] != target[i]:
+                steps.append((current.copy(), f"Intercambiar {current[i]} con {target[i]}"))
+                current[i] = target[i]
+        return steps
+
+    genome = Genome(genes)
+    for i, j in reversals:
+        genome.reverse(i, j)
+    return _ReversalSteps(genome)
@@ -0,0 +1,46 @@
+"""Benchmarks de los generadores de Lab6 sin la interfaz Tk.
+
+Uso desde la raíz del repositorio:
+    python -m Waofin.bench_lab6 --sizes 6 8 10 --dup 0 0.5 --csv lab6.csv
+"""
+import argparse
+from itertools import combinations, permutations
+
+from Waofin.benchmark import consume, sweep, write_csv, write_json
+from Waofin.Lab6_Waofin import iter_unique_combinations, iter_unique_permutations
+
+# Cada caso recibe la lista de elementos y hace el trabajo completo
+CASES = {
+    "unique_permutations": lambda e: consume(iter_unique_permutations(e)),
+    "itertools_permutations": lambda e: set(permutations(e)),
+    "unique_combinations": lambda e: consume(iter_unique_combinations(e, len(e) // 2)),
+    "itertools_combinations": lambda e: set(combinations(sorted(e), len(e) // 2)),
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de permutaciones y combinaciones únicas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 8, 10])
+    parser.add_argument("--dup", type=float, nargs="+", default=[0.0, 0.25, 0.5])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=sorted(CASES))
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--no-memory", action="store_true", help="No medir memoria pico")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv")
+    parser.add_argument("--json")
+    args = parser.parse_args(argv)
+
+    rows = sweep({name: CASES[name] for name in args.cases}, args.sizes, args.dup,
+                 warmup=args.warmup, repeat=args.repeat,
+                 measure_memory=not args.no_memory, seed=args.seed)
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        write_json(rows, args.json)
+    for row in rows:
+        print(f"{row['name']:<24} n={row['n']:<4} dup={row['dup_ratio']:<5} "
+              f"mediana={row['median_ns'] / 1e6:.3f} ms  IQR={row['iqr_ns'] / 1e6:.3f} ms  "
+              f"pico={row['peak_bytes']} B")
+
+if __name__ == "__main__":
+    main()
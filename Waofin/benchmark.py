@@ -0,0 +1,86 @@
+"""Utilidades de benchmark reutilizables (sin interfaz Tk); ver Waofin/bench_lab6.py"""
+import csv
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from collections import deque
+
+FIELDS = ["name", "n", "dup_ratio", "runs", "median_ns", "iqr_ns", "min_ns", "max_ns", "peak_bytes"]
+
+
+def consume(iterable):
+    """Recorre un iterable sin guardar sus elementos"""
+    deque(iterable, maxlen=0)
+
+def benchmark(func, *args, warmup=1, repeat=7, measure_memory=True, **kwargs):
+    """Mide func(*args, **kwargs): mediana e IQR en ns tras `warmup` corridas de calentamiento.
+
+    La memoria pico se mide con tracemalloc en una corrida aparte, para que
+    su sobrecarga no contamine los tiempos.
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat debe ser al menos 1: {repeat}")
+    for _ in range(warmup):
+        func(*args, **kwargs)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func(*args, **kwargs)
+        times.append(time.perf_counter_ns() - start)
+
+    if len(times) > 1:
+        q1, _, q3 = statistics.quantiles(times, n=4, method='inclusive')
+    else:
+        q1 = q3 = times[0]
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "runs": repeat,
+        "median_ns": int(statistics.median(times)),
+        "iqr_ns": int(q3 - q1),
+        "min_ns": min(times),
+        "max_ns": max(times),
+        "peak_bytes": peak,
+    }
+
+def make_elements(n, dup_ratio, seed=0):
+    """Lista de n elementos donde una fracción dup_ratio son repeticiones"""
+    distinct = min(n, max(1, round(n * (1 - dup_ratio))))
+    elements = [f"E{i}" for i in range(distinct)]
+    rng = random.Random(seed)
+    elements += [rng.choice(elements[:distinct]) for _ in range(n - distinct)]
+    rng.shuffle(elements)
+    return elements
+
+def sweep(cases, sizes, dup_ratios, warmup=1, repeat=7, measure_memory=True, seed=0):
+    """Corre cada caso {nombre: func(elementos)} para cada tamaño y proporción de duplicados.
+
+    Devuelve una fila (dict con las columnas de FIELDS) por medición.
+    """
+    rows = []
+    for n in sizes:
+        for dup_ratio in dup_ratios:
+            elements = make_elements(n, dup_ratio, seed)
+            for name, case in cases.items():
+                stats = benchmark(case, elements, warmup=warmup, repeat=repeat,
+                                  measure_memory=measure_memory)
+                rows.append({"name": name, "n": n, "dup_ratio": dup_ratio, **stats})
+    return rows
+
+def write_csv(rows, path, fields=FIELDS):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_json(rows, path):
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
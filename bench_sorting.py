@@ -0,0 +1,65 @@
+"""Benchmark de los algoritmos de ordenamiento trazados (sorting.SORTS) sin la interfaz Tk.
+
+Mide cuánto tarda cada algoritmo en generar su traza completa sobre
+permutaciones aleatorias de 1..n y reporta sus contadores exactos.
+
+Uso desde la raíz del repositorio:
+    python bench_sorting.py --sizes 8 100 1000 --csv sorting.csv
+"""
+import argparse
+
+import numpy as np
+
+from sorting import SORTS
+from Waofin.benchmark import benchmark, write_csv, write_json
+
+FIELDS = ["name", "n", "runs", "median_ns", "iqr_ns", "steps", "comparisons", "swaps", "moves",
+          "reversals", "steps_per_s", "trace_bytes"]
+
+
+def trace_bytes(trace):
+    """Memoria de la traza: registro de operaciones más puntos de control"""
+    return trace.log.nbytes + sum(c.nbytes for c in trace.checkpoints)
+
+def run(names, sizes, repeat=3, warmup=0, seed=0):
+    """Una fila por algoritmo y tamaño; cada traza se verifica contra sorted()"""
+    rows = []
+    for n in sizes:
+        sequence = (np.random.default_rng(seed).permutation(n) + 1).tolist()
+        for name in names:
+            sort = SORTS[name]
+            trace = sort(sequence)
+            if list(trace.state(len(trace))) != sorted(sequence):
+                raise AssertionError(f"{name} no ordenó la secuencia de {n} elementos")
+            stats = benchmark(sort, sequence, warmup=warmup, repeat=repeat, measure_memory=False)
+            rows.append({
+                "name": name, "n": n, "runs": stats["runs"], "median_ns": stats["median_ns"],
+                "iqr_ns": stats["iqr_ns"], **trace.counters(),
+                "steps_per_s": len(trace) / max(stats["median_ns"], 1) * 1e9,
+                "trace_bytes": trace_bytes(trace),
+            })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los algoritmos de ordenamiento trazados")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 100, 1000])
+    parser.add_argument("--sorts", nargs="+", choices=list(SORTS), default=list(SORTS))
+    parser.add_argument("--warmup", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv")
+    parser.add_argument("--json")
+    args = parser.parse_args(argv)
+
+    rows = run(args.sorts, args.sizes, repeat=args.repeat, warmup=args.warmup, seed=args.seed)
+    if args.csv:
+        write_csv(rows, args.csv, FIELDS)
+    if args.json:
+        write_json(rows, args.json)
+    for row in rows:
+        print(f"{row['name']:<10} n={row['n']:<6} mediana={row['median_ns'] / 1e6:9.3f} ms  "
+              f"pasos={row['steps']:<9} comp={row['comparisons']:<9} inter={row['swaps']:<9} "
+              f"mov={row['moves']:<9} rev={row['reversals']:<5} {row['steps_per_s'] / 1e6:.2f} Mpasos/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from functools import cached_property
+
+import networkx as nx
+import numpy as np
+
+
+class CSRGraph:
+    """Grafo no dirigido compacto: ids enteros 0..n-1 y adyacencia CSR en NumPy.
+
+    Cada arista se guarda una sola vez en src/dst; indptr/indices guardan la
+    adyacencia por filas (un lazo aparece una vez, como en nx.Graph.neighbors).
+    Expone nodes(), edges(), neighbors() y number_of_*() igual que nx.Graph.
+    """
+
+    def __init__(self, labels, src, dst):
+        self.labels = labels
+        n = len(labels)
+        id_type = np.int32 if n < 2**31 else np.int64
+        self.src = np.ascontiguousarray(src, dtype=id_type)
+        self.dst = np.ascontiguousarray(dst, dtype=id_type)
+
+        loops = self.src == self.dst
+        rows = np.concatenate([self.src, self.dst[~loops]])
+        cols = np.concatenate([self.dst, self.src[~loops]])
+        order = np.argsort(rows, kind='stable')
+        self.indices = cols[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+
+    @classmethod
+    def from_networkx(cls, graph):
+        labels = list(graph.nodes())
+        index = {node: i for i, node in enumerate(labels)}
+        m = graph.number_of_edges()
+        src = np.fromiter((index[u] for u, _ in graph.edges()), dtype=np.int64, count=m)
+        dst = np.fromiter((index[v] for _, v in graph.edges()), dtype=np.int64, count=m)
+        return cls(labels, src, dst)
+
+    @classmethod
+    def from_edges(cls, edges, nodes=None):
+        """Construye el grafo desde una lista de aristas (u, v).
+
+        Si edges es un array entero (m, 2) y no se dan nodos, los valores se
+        usan directamente como ids 0..n-1. Las aristas repetidas se descartan.
+        """
+        if isinstance(edges, np.ndarray) and nodes is None and np.issubdtype(edges.dtype, np.integer):
+            pairs = edges.reshape(-1, 2)
+            n = int(pairs.max()) + 1 if len(pairs) else 0
+            labels = range(n)
+        else:
+            labels = list(nodes) if nodes is not None else []
+            index = {label: i for i, label in enumerate(labels)}
+            flat = []
+            for u, v in edges:
+                for x in (u, v):
+                    if x not in index:
+                        index[x] = len(labels)
+                        labels.append(x)
+                flat.append(index[u])
+                flat.append(index[v])
+            pairs = np.array(flat, dtype=np.int64).reshape(-1, 2)
+            n = len(labels)
+
+        # Igual que nx.Graph: (u, v) y (v, u) son la misma arista
+        lo = np.minimum(pairs[:, 0], pairs[:, 1]).astype(np.int64)
+        hi = np.maximum(pairs[:, 0], pairs[:, 1]).astype(np.int64)
+        _, first = np.unique(lo * max(n, 1) + hi, return_index=True)
+        first.sort()
+        return cls(labels, pairs[first, 0], pairs[first, 1])
+
+    @classmethod
+    def load(cls, path):
+        """Lee un grafo guardado con save(); las etiquetas pasan a ser los ids 0..n-1"""
+        with np.load(path) as data:
+            return cls(range(int(data['n'])), data['src'], data['dst'])
+
+    def save(self, path):
+        """Guarda la lista de aristas en un .npz sin comprimir (n, src, dst como enteros)"""
+        np.savez(path, n=len(self.labels), src=self.src, dst=self.dst)
+
+    @cached_property
+    def index(self):
+        return {label: i for i, label in enumerate(self.labels)}
+
+    def number_of_nodes(self):
+        return len(self.labels)
+
+    def number_of_edges(self):
+        return len(self.src)
+
+    def nodes(self):
+        return list(self.labels)
+
+    def edges(self):
+        labels = self.labels
+        return [(labels[u], labels[v]) for u, v in zip(self.src.tolist(), self.dst.tolist())]
+
+    def neighbors(self, node):
+        i = self.index[node]
+        labels = self.labels
+        return iter([labels[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]].tolist()])
+
+    def degree(self):
+        """Número de vecinos por id (un lazo cuenta una vez)"""
+        return np.diff(self.indptr)
+
+    def mask(self, subset):
+        """Máscara booleana por id de los nodos de subset"""
+        mask = np.zeros(len(self.labels), dtype=bool)
+        ids = [self.index[node] for node in subset]
+        mask[ids] = True
+        return mask
+
+    def to_networkx(self):
+        graph = nx.Graph()
+        graph.add_nodes_from(self.labels)
+        graph.add_edges_from(self.edges())
+        return graph
@@ -0,0 +1,135 @@
+"""Ejecución de algoritmos en segundo plano para interfaces Tk.
+
+Un trabajo es una función func(job, *args) que corre en un hilo o en un
+proceso aparte. Se comunica con la interfaz solo por una cola de mensajes que
+JobExecutor revisa con root.after, así los callbacks siempre corren en el hilo
+de Tk. La cancelación es cooperativa: el trabajo llama job.check() cada tanto
+y este lanza JobCancelled si se pidió detenerlo.
+"""
+import multiprocessing
+import queue
+import threading
+import traceback
+
+
+class JobCancelled(Exception):
+    """El trabajo se detuvo porque se pidió cancelarlo"""
+
+
+class Job:
+    """Lado del trabajo: reporta avances y revisa si debe detenerse"""
+
+    def __init__(self, messages, cancel_event):
+        self._messages = messages
+        self._cancel = cancel_event
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, message=None, partial=None):
+        """Envía un mensaje de avance y/o un resultado parcial a la interfaz"""
+        self._messages.put(("progress", message, partial))
+
+
+def _run_job(func, args, messages, cancel_event):
+    job = Job(messages, cancel_event)
+    try:
+        result = func(job, *args)
+    except JobCancelled:
+        messages.put(("cancelled", None, None))
+    except Exception as e:
+        messages.put(("error", f"{e}", traceback.format_exc()))
+    else:
+        messages.put(("done", result, None))
+
+
+class JobExecutor:
+    """Corre un trabajo a la vez y entrega sus mensajes en el hilo de Tk.
+
+    Con process=True el trabajo corre en un proceso nuevo (contexto spawn, no
+    se hereda el estado de Tk): func, sus argumentos y su resultado deben poder
+    serializarse con pickle. Si un proceso no atiende la cancelación en
+    `grace_ms`, se termina.
+    """
+
+    def __init__(self, root, poll_ms=50, grace_ms=2000):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.grace_ms = grace_ms
+        self._current = None
+
+    @property
+    def busy(self):
+        return self._current is not None
+
+    def start(self, func, *args, on_done, on_progress=None, on_error=None, on_cancel=None, process=False):
+        """Lanza func(job, *args); devuelve False sin hacer nada si ya hay un trabajo corriendo"""
+        if self.busy:
+            return False
+        if process:
+            context = multiprocessing.get_context("spawn")
+            messages = context.Queue()
+            cancel_event = context.Event()
+            worker = context.Process(target=_run_job, args=(func, args, messages, cancel_event), daemon=True)
+        else:
+            messages = queue.Queue()
+            cancel_event = threading.Event()
+            worker = threading.Thread(target=_run_job, args=(func, args, messages, cancel_event), daemon=True)
+        self._current = {
+            "worker": worker, "messages": messages, "cancel": cancel_event, "process": process,
+            "on_done": on_done, "on_progress": on_progress, "on_error": on_error, "on_cancel": on_cancel,
+        }
+        worker.start()
+        self.root.after(self.poll_ms, self._poll)
+        return True
+
+    def stop(self):
+        """Pide al trabajo actual que se detenga"""
+        current = self._current
+        if current is None or current["cancel"].is_set():
+            return
+        current["cancel"].set()
+        if current["process"]:
+            self.root.after(self.grace_ms, self._terminate, current)
+
+    def _terminate(self, current):
+        # El proceso no llegó a revisar la cancelación: se corta a la fuerza
+        if self._current is current and current["worker"].is_alive():
+            current["worker"].terminate()
+            self._finish("cancelled", None, None)
+
+    def _poll(self):
+        current = self._current
+        if current is None:
+            return
+        while True:
+            try:
+                kind, value, extra = current["messages"].get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if current["on_progress"] is not None:
+                    current["on_progress"](value, extra)
+            else:
+                self._finish(kind, value, extra)
+                return
+        if not current["worker"].is_alive() and current["messages"].empty():
+            # Terminó sin avisar (p. ej. el proceso murió)
+            self._finish("error", "El trabajo terminó inesperadamente.", None)
+            return
+        self.root.after(self.poll_ms, self._poll)
+
+    def _finish(self, kind, value, extra):
+        current, self._current = self._current, None
+        if kind == "done":
+            current["on_done"](value)
+        elif kind == "cancelled":
+            if current["on_cancel"] is not None:
+                current["on_cancel"]()
+        elif current["on_error"] is not None:
+            current["on_error"](value, extra)
@@ -0,0 +1,158 @@
+"""Generadores de redes PPI sintéticas para pruebas de carga.
+
+Cada modelo arma los arreglos de aristas con un generador de NumPy con semilla
+y devuelve un CSRGraph simple (sin lazos ni aristas repetidas, ids 0..n-1).
+Con CSRGraph.save / CSRGraph.load las redes se guardan y se vuelven a leer.
+
+Uso desde la raíz del repositorio:
+    python ppi_networks.py barabasi_albert 1000000 --m 3 --out ba.npz
+"""
+import argparse
+import math
+import random
+import time
+from array import array
+from itertools import product
+
+import numpy as np
+
+from graph_csr import CSRGraph
+
+
+def _simple_graph(n, src, dst):
+    """CSRGraph sin lazos ni aristas repetidas a partir de extremos en arreglos"""
+    lo = np.minimum(src, dst).astype(np.int64)
+    hi = np.maximum(src, dst).astype(np.int64)
+    keep = lo != hi
+    key = np.sort(lo[keep] * n + hi[keep])
+    key = key[np.concatenate(([True], key[1:] != key[:-1]))[:len(key)]]  # más rápido que np.unique
+    return CSRGraph(range(n), key // n, key % n)
+
+
+def duplication_divergence(n, retain=0.4, link=0.1, seed=0):
+    """Duplicación-divergencia: cada proteína nueva copia una existente al azar.
+
+    La copia conserva cada interacción del original con probabilidad `retain`
+    y se une al original con probabilidad `link`; si no conservó ninguna, se
+    une al original para no quedar aislada. Cada paso depende de los anteriores,
+    así que el crecimiento es un ciclo en Python sobre listas de vecinos; los
+    originales y la semilla del azar salen del generador de NumPy.
+    """
+    rng = np.random.default_rng(seed)
+    rnd = random.Random(int(rng.integers(2**63))).random
+    parents = (rng.random(n) * np.arange(n)).astype(np.int64).tolist()
+    adj = [[1], [0]] + [None] * max(n - 2, 0)
+    src, dst = array('q', [0]), array('q', [1])
+    for t in range(2, n):
+        p = parents[t]
+        kept = [u for u in adj[p] if rnd() < retain]
+        if not kept or rnd() < link:
+            kept.append(p)
+        adj[t] = kept
+        for u in kept:
+            adj[u].append(t)
+        src.extend([t] * len(kept))
+        dst.extend(kept)
+    if n < 2:
+        return CSRGraph(range(n), [], [])
+    return _simple_graph(n, np.frombuffer(src, dtype=np.int64), np.frombuffer(dst, dtype=np.int64))
+
+
+def barabasi_albert(n, m=3, seed=0):
+    """Preferencial (Barabási–Albert) con el método de Batagelj y Brandes, vectorizado.
+
+    La arista e = v*m + i une v con el extremo de una posición r al azar en
+    [0, 2e] de la lista de extremos, lo que elige un nodo con probabilidad
+    proporcional a su grado. Las posiciones impares apuntan a otras anteriores,
+    así que se resuelven siguiendo los punteros en bloque. Los lazos y las
+    aristas repetidas se descartan, así que quedan algo menos de n*m aristas.
+    """
+    rng = np.random.default_rng(seed)
+    total = n * m
+    e = np.arange(total, dtype=np.int64)
+    pointer = (rng.random(total) * (2 * e + 1)).astype(np.int64)
+    target = pointer.copy()
+    while True:
+        odd = np.flatnonzero(target & 1)
+        if not len(odd):
+            break
+        target[odd] = pointer[target[odd] >> 1]
+    return _simple_graph(n, e // m, (target >> 1) // m)
+
+
+def geometric(n, mean_degree=6.0, dim=2, radius=None, seed=0):
+    """Grafo geométrico: puntos al azar en el cubo unitario, unidos si están a menos de `radius`.
+
+    Si no se da el radio se elige para que el grado medio (sin contar el borde)
+    sea mean_degree. Los puntos se ordenan por celdas de lado >= radius y solo
+    se comparan celdas vecinas. Los ids siguen el orden de las celdas.
+    """
+    rng = np.random.default_rng(seed)
+    if radius is None:
+        ball = math.pi ** (dim / 2) / math.gamma(dim / 2 + 1)
+        radius = (mean_degree / (max(n, 1) * ball)) ** (1 / dim)
+    side = max(1, min(int(1 / radius), int(round(max(n, 1) ** (1 / dim)))))
+    points = rng.random((n, dim))
+    cell = np.minimum((points * side).astype(np.int64), side - 1)
+    ids = np.ravel_multi_index(cell.T, (side,) * dim)
+    order = np.argsort(ids, kind='stable')
+    points, cell, ids = points[order], cell[order], ids[order]
+    starts = np.searchsorted(ids, np.arange(side ** dim + 1))
+
+    src, dst = [], []
+    zero = (0,) * dim
+    for offset in product((-1, 0, 1), repeat=dim):
+        if offset < zero:
+            continue  # cada par de celdas se visita una sola vez
+        near = cell + offset
+        valid = np.flatnonzero(((near >= 0) & (near < side)).all(axis=1))
+        near_ids = np.ravel_multi_index(near[valid].T, (side,) * dim)
+        lo, count = starts[near_ids], starts[near_ids + 1] - starts[near_ids]
+        i = np.repeat(valid, count)
+        j = np.repeat(lo - np.cumsum(count) + count, count) + np.arange(count.sum())
+        if offset == zero:
+            keep = j > i
+            i, j = i[keep], j[keep]
+        close = ((points[i] - points[j]) ** 2).sum(axis=1) <= radius * radius
+        src.append(i[close])
+        dst.append(j[close])
+    return CSRGraph(range(n), np.concatenate(src), np.concatenate(dst))
+
+
+MODELS = {
+    "duplication_divergence": duplication_divergence,
+    "barabasi_albert": barabasi_albert,
+    "geometric": geometric,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una red PPI sintética y guarda su lista de aristas")
+    parser.add_argument("model", choices=list(MODELS))
+    parser.add_argument("n", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--retain", type=float, default=0.4, help="duplication_divergence")
+    parser.add_argument("--link", type=float, default=0.1, help="duplication_divergence")
+    parser.add_argument("--m", type=int, default=3, help="barabasi_albert")
+    parser.add_argument("--mean-degree", type=float, default=6.0, help="geometric")
+    parser.add_argument("--dim", type=int, default=2, help="geometric")
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+
+    params = {
+        "duplication_divergence": {"retain": args.retain, "link": args.link},
+        "barabasi_albert": {"m": args.m},
+        "geometric": {"mean_degree": args.mean_degree, "dim": args.dim},
+    }[args.model]
+    start = time.perf_counter()
+    graph = MODELS[args.model](args.n, seed=args.seed, **params)
+    elapsed = time.perf_counter() - start
+    degree = graph.degree()
+    print(f"{args.model}: {graph.number_of_nodes()} nodos, {graph.number_of_edges()} aristas, "
+          f"grado medio {degree.mean() if len(degree) else 0:.2f}, máximo {degree.max(initial=0)}, "
+          f"{elapsed:.2f} s")
+    if args.out:
+        graph.save(args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Trazas compactas de ordenamiento para la visualización paso a paso.
+
+La traza guarda la secuencia inicial, el registro de operaciones como pares
+int32 y una copia del estado cada `every` operaciones. Cualquier paso se
+reconstruye desde el punto de control anterior en O(every + n), en lugar de
+guardar una copia de la secuencia por paso. Con enteros, los puntos de control
+son int32 y por defecto every = 4n, así que ocupan un octavo del registro.
+
+Cada algoritmo de SORTS recibe la secuencia y devuelve su SortTrace, con los
+contadores exactos de comparaciones, intercambios, movimientos y reversiones.
+"""
+from array import array
+
+import numpy as np
+
+INT32 = np.iinfo(np.int32)
+
+
+class SortTrace:
+    """Registro de las operaciones de un ordenamiento.
+
+    Mientras se registra, el algoritmo trabaja sobre trace.values (una lista)
+    y la modifica solo con swap(i, j), write(i, valor) o reverse(i, j).
+    Después, trace.state(k) devuelve la secuencia tras k operaciones (k = 0 es
+    la inicial) y len(trace) es el total.
+
+    Contadores: comparisons (entre elementos), swaps, moves (elementos escritos
+    en la secuencia o en memoria auxiliar; un intercambio escribe dos) y
+    reversals (reversiones de un tramo, como en el ordenamiento por reversiones).
+    """
+
+    def __init__(self, sequence, every=None):
+        self.values = list(sequence)
+        self.initial = np.array(self.values)
+        if self.initial.dtype.kind in "iu" and self.initial.size and \
+                INT32.min <= self.initial.min() and self.initial.max() <= INT32.max:
+            self.initial = self.initial.astype(np.int32)
+        # Cada punto de control ocupa n valores y el registro 2 int32 por paso
+        self.every = every or max(256, 4 * len(self.values))
+        self.checkpoints = [self.initial.copy()]
+        self._pairs = array('i')
+        self._count = 0
+        self._writes = 0
+        self._cursor = None
+        self._cursor_step = 0
+        self.comparisons = 0
+        self.swaps = 0
+        self.moves = 0
+        self.reversals = 0
+
+    def _step(self):
+        self._count += 1
+        if self._count % self.every == 0:
+            self.checkpoints.append(np.array(self.values, dtype=self.initial.dtype))
+
+    def greater(self, i, j):
+        """values[i] > values[j], contando la comparación"""
+        self.comparisons += 1
+        return self.values[i] > self.values[j]
+
+    def swap(self, i, j):
+        """Intercambia values[i] y values[j] y lo anota"""
+        values = self.values
+        values[i], values[j] = values[j], values[i]
+        self._pairs.append(i)
+        self._pairs.append(j)
+        self.swaps += 1
+        self.moves += 2
+        self._step()
+
+    def write(self, i, value):
+        """Escribe un valor entero en values[i] (se anota como el par (~i, valor))"""
+        self.values[i] = value
+        self._pairs.append(~i)
+        self._pairs.append(value)
+        self._writes += 1
+        self.moves += 1
+        self._step()
+
+    def reverse(self, i, j):
+        """Invierte values[i..j] con intercambios (una reversión, (j - i + 1) // 2 pasos)"""
+        self.reversals += 1
+        while i < j:
+            self.swap(i, j)
+            i += 1
+            j -= 1
+
+    @property
+    def log(self):
+        """Arreglo (pasos, 2) int32 de operaciones: (i, j) intercambio, (~i, v) escritura (sin copiar el registro)"""
+        return np.frombuffer(self._pairs, dtype=np.int32).reshape(-1, 2)
+
+    def counters(self):
+        return {"steps": self._count, "comparisons": self.comparisons, "swaps": self.swaps,
+                "moves": self.moves, "reversals": self.reversals}
+
+    def __len__(self):
+        return self._count
+
+    def state(self, step):
+        """Secuencia tras `step` operaciones.
+
+        Si el último estado pedido está a menos de `every` pasos se avanza desde
+        ahí, o se retrocede si la traza solo tiene intercambios (un intercambio
+        se deshace repitiéndolo); si no, se parte del punto de control anterior.
+        """
+        if not 0 <= step <= self._count:
+            raise IndexError(f"Paso fuera de rango: {step}")
+        if (self._cursor is None or abs(step - self._cursor_step) >= self.every
+                or (step < self._cursor_step and self._writes)):
+            base = step // self.every
+            self._cursor = self.checkpoints[base].tolist()
+            self._cursor_step = base * self.every
+        cursor, pairs = self._cursor, self._pairs
+        if step > self._cursor_step:
+            for k in range(self._cursor_step, step):
+                i, j = pairs[2 * k], pairs[2 * k + 1]
+                if i >= 0:
+                    cursor[i], cursor[j] = cursor[j], cursor[i]
+                else:
+                    cursor[~i] = j
+        else:
+            for k in range(self._cursor_step - 1, step - 1, -1):
+                i, j = pairs[2 * k], pairs[2 * k + 1]
+                cursor[i], cursor[j] = cursor[j], cursor[i]
+        self._cursor_step = step
+        return np.array(cursor, dtype=self.initial.dtype)
+
+    def __getstate__(self):
+        # La lista de trabajo y el cursor no hacen falta para reconstruir pasos
+        state = self.__dict__.copy()
+        state.update(values=None, _cursor=None, _cursor_step=0)
+        return state
+
+
+def bubble_sort_trace(sequence, every=None, check=None):
+    """Ordenamiento burbuja (un paso por intercambio de vecinos)"""
+    trace = SortTrace(sequence, every)
+    n = len(trace.values)
+    for i in range(n):
+        if check is not None:
+            check()  # Permite detener la generación de pasos
+        swapped = False
+        for j in range(0, n-i-1):
+            if trace.greater(j, j+1):
+                trace.swap(j, j+1)
+                swapped = True
+        if not swapped:
+            break
+    return trace
+
+
+def insertion_sort_trace(sequence, every=None, check=None):
+    """Inserción: cada elemento baja con intercambios de vecinos hasta su lugar"""
+    trace = SortTrace(sequence, every)
+    for i in range(1, len(trace.values)):
+        if check is not None:
+            check()
+        j = i
+        while j > 0 and trace.greater(j-1, j):
+            trace.swap(j-1, j)
+            j -= 1
+    return trace
+
+
+def merge_sort_trace(sequence, every=None, check=None):
+    """Mezcla de abajo hacia arriba: copia la mitad izquierda a un búfer y mezcla escribiendo en su lugar"""
+    trace = SortTrace(sequence, every)
+    a = trace.values
+    n = len(a)
+    width = 1
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            if check is not None:
+                check()
+            mid, hi = lo + width, min(lo + 2 * width, n)
+            left = a[lo:mid]
+            trace.moves += len(left)
+            i, j, k = 0, mid, lo
+            while i < len(left) and j < hi:
+                trace.comparisons += 1
+                if a[j] < left[i]:
+                    trace.write(k, a[j])
+                    j += 1
+                else:
+                    trace.write(k, left[i])
+                    i += 1
+                k += 1
+            # Lo que queda de la mitad derecha ya está en su lugar
+            for value in left[i:]:
+                trace.write(k, value)
+                k += 1
+        width *= 2
+    return trace
+
+
+def heap_sort_trace(sequence, every=None, check=None):
+    """Montículo de máximos: se arma en su lugar y se extrae la raíz al final"""
+    trace = SortTrace(sequence, every)
+    n = len(trace.values)
+
+    def sift_down(root, end):
+        while 2 * root + 1 < end:
+            child = 2 * root + 1
+            if child + 1 < end and trace.greater(child + 1, child):
+                child += 1
+            if not trace.greater(child, root):
+                return
+            trace.swap(root, child)
+            root = child
+
+    for start in range(n // 2 - 1, -1, -1):
+        sift_down(start, n)
+    for end in range(n - 1, 0, -1):
+        if check is not None:
+            check()
+        trace.swap(0, end)
+        sift_down(0, end)
+    return trace
+
+
+def quick_sort_trace(sequence, every=None, check=None):
+    """Quicksort iterativo (partición de Lomuto con el pivote del medio).
+
+    Se procesa primero el tramo más corto, así la pila tiene O(log n) tramos.
+    """
+    trace = SortTrace(sequence, every)
+    stack = [(0, len(trace.values) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        if check is not None:
+            check()
+        mid = (lo + hi) // 2
+        if mid != hi:
+            trace.swap(mid, hi)
+        store = lo
+        for i in range(lo, hi):
+            if trace.greater(hi, i):
+                if i != store:
+                    trace.swap(i, store)
+                store += 1
+        if store != hi:
+            trace.swap(store, hi)
+        left, right = (lo, store - 1), (store + 1, hi)
+        if store - lo < hi - store:
+            stack += [right, left]
+        else:
+            stack += [left, right]
+    return trace
+
+
+def radix_sort_trace(sequence, every=None, check=None, base=10):
+    """Radix LSD en base `base` para enteros no negativos (sin comparaciones).
+
+    Cada pasada reparte los valores en cubetas por dígito (memoria auxiliar) y
+    los vuelve a escribir en orden.
+    """
+    trace = SortTrace(sequence, every)
+    a = trace.values
+    if a and min(a) < 0:
+        raise ValueError("El ordenamiento radix necesita enteros no negativos")
+    biggest = max(a, default=0)
+    exp = 1
+    while biggest // exp > 0:
+        if check is not None:
+            check()
+        buckets = [[] for _ in range(base)]
+        for value in a:
+            buckets[(value // exp) % base].append(value)
+        trace.moves += len(a)
+        k = 0
+        for bucket in buckets:
+            for value in bucket:
+                trace.write(k, value)
+                k += 1
+        exp *= base
+    return trace
+
+
+def pancake_sort_trace(sequence, every=None, check=None):
+    """Ordenamiento por reversiones de prefijos (pancake).
+
+    En cada vuelta el máximo del prefijo sin ordenar se lleva al frente y
+    luego a su posición final, con a lo sumo dos reversiones.
+    """
+    trace = SortTrace(sequence, every)
+    for size in range(len(trace.values), 1, -1):
+        if check is not None:
+            check()
+        top = 0
+        for i in range(1, size):
+            if trace.greater(i, top):
+                top = i
+        if top == size - 1:
+            continue
+        if top > 0:
+            trace.reverse(0, top)
+        trace.reverse(0, size - 1)
+    return trace
+
+
+SORTS = {
+    "bubble": bubble_sort_trace,
+    "insertion": insertion_sort_trace,
+    "merge": merge_sort_trace,
+    "heap": heap_sort_trace,
+    "quick": quick_sort_trace,
+    "radix": radix_sort_trace,
+    "pancake": pancake_sort_trace,
+}
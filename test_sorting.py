@@ -0,0 +1,27 @@
+"""Pruebas de las trazas de ordenamiento (sorting.py).
+
+Uso desde la raíz del repositorio:
+    python -m pytest test_sorting.py
+"""
+import numpy as np
+
+from bench_sorting import trace_bytes
+from sorting import SORTS
+
+
+def test_traces_sort():
+    sequence = (np.random.default_rng(0).permutation(300) + 1).tolist()
+    for name, sort in SORTS.items():
+        trace = sort(sequence)
+        assert list(trace.state(len(trace))) == sorted(sequence), name
+        assert list(trace.state(0)) == sequence, name
+
+
+def test_checkpoints_smaller_than_log():
+    for n in (100, 1000):
+        sequence = (np.random.default_rng(n).permutation(n) + 1).tolist()
+        for name in ("bubble", "insertion", "pancake"):
+            trace = SORTS[name](sequence)
+            checkpoints = trace_bytes(trace) - trace.log.nbytes
+            assert trace.initial.dtype == np.int32
+            assert checkpoints < trace.log.nbytes / 4, (name, n, checkpoints, trace.log.nbytes)
@@ -0,0 +1,47 @@
+"""Pruebas de los vertex cover exactos (vertex_cover.py) contra la fuerza bruta.
+
+Uso desde la raíz del repositorio:
+    python -m pytest test_vertex_cover.py
+"""
+import random
+
+import networkx as nx
+
+from graph_csr import CSRGraph
+from vertex_cover import (bitset_vertex_cover, brute_force_vertex_cover, exact_vertex_cover,
+                          parallel_vertex_cover)
+
+
+def random_graph(rng, n, p, loops=0.0, strings=False):
+    """Grafo de networkx con nodos en orden mezclado, lazos opcionales y etiquetas de texto"""
+    labels = [f"n{i}" if strings else i for i in range(n)]
+    rng.shuffle(labels)
+    graph = nx.Graph()
+    graph.add_nodes_from(labels)
+    for i in range(n):
+        if rng.random() < loops:
+            graph.add_edge(labels[i], labels[i])
+        for j in range(i + 1, n):
+            if rng.random() < p:
+                graph.add_edge(labels[i], labels[j])
+    return graph
+
+
+def test_exact_matches_brute_force():
+    rng = random.Random(0)
+    for t in range(300):
+        graph = random_graph(rng, rng.randint(0, 11), rng.random(), loops=0.1 * (t % 3), strings=t % 2 == 1)
+        expected = brute_force_vertex_cover(graph)
+        assert exact_vertex_cover(graph) == expected, sorted(graph.edges())
+        assert bitset_vertex_cover(graph) == expected, sorted(graph.edges())
+        if t % 10 == 0:
+            assert exact_vertex_cover(CSRGraph.from_networkx(graph)) == expected, sorted(graph.edges())
+
+
+def test_parallel_matches_brute_force():
+    rng = random.Random(1)
+    for t in range(6):
+        graph = random_graph(rng, 11, 0.15 + 0.1 * t, loops=0.05, strings=t % 2 == 1)
+        expected = brute_force_vertex_cover(graph)
+        for workers in (2, 3):
+            assert parallel_vertex_cover(graph, workers=workers, min_nodes=0) == expected, sorted(graph.edges())
@@ -0,0 +1,744 @@
+import heapq
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations, count
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from graph_csr import CSRGraph
+
+
+def _indexed_edges(graph):
+    """(nodos, src, dst) con los extremos de cada arista como índices enteros"""
+    if isinstance(graph, CSRGraph):
+        return graph.labels, graph.src.tolist(), graph.dst.tolist()
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    src = []
+    dst = []
+    for u, v in graph.edges():
+        src.append(index[u])
+        dst.append(index[v])
+    return nodes, src, dst
+
+def is_vertex_cover(graph, subset):
+    if isinstance(graph, CSRGraph):
+        mask = graph.mask(subset)
+        return bool(np.all(mask[graph.src] | mask[graph.dst]))
+    for u, v in graph.edges():
+        if u not in subset and v not in subset:
+            return False
+    return True
+
+def batch_vertex_cover_check(graph, candidates, chunk_size=1024):
+    """Verifica muchos subconjuntos candidatos a la vez.
+
+    candidates es una matriz (k, n) con una fila por candidato y las columnas
+    en el orden de graph.nodes(): booleana, o uint8 empaquetada con
+    np.packbits(..., axis=1). Devuelve (es_cover, aristas_sin_cubrir) por fila.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_networkx(graph)
+    n = graph.number_of_nodes()
+    candidates = np.asarray(candidates)
+    packed = candidates.dtype == np.uint8
+    uncovered = np.empty(len(candidates), dtype=np.int64)
+    # Por bloques para acotar la matriz intermedia (bloque x aristas)
+    for start in range(0, len(candidates), chunk_size):
+        block = candidates[start:start + chunk_size]
+        if packed:
+            block = np.unpackbits(block, axis=1, count=n).view(bool)
+        else:
+            block = block.astype(bool, copy=False)
+        covered = block[:, graph.src] | block[:, graph.dst]
+        uncovered[start:start + len(block)] = graph.number_of_edges() - covered.sum(axis=1)
+    return uncovered == 0, uncovered
+
+def brute_force_vertex_cover(graph):
+    nodes = list(graph.nodes())
+    for k in range(1, len(nodes) + 1):
+        for subset in combinations(nodes, k):
+            if is_vertex_cover(graph, subset):
+                return subset
+    return None
+
+def _bitset_tables(n, src, dst):
+    """Bitmask de aristas incidentes por nodo y extremo mayor de cada bit de arista"""
+    # Bits de arista ordenados por su extremo mayor: el bit más bajo sin cubrir
+    # es siempre la arista que antes deja de poder cubrirse
+    order = sorted(range(len(src)), key=lambda e: max(src[e], dst[e]))
+    incident = [0] * n
+    last = []
+    for bit, e in enumerate(order):
+        incident[src[e]] |= 1 << bit
+        incident[dst[e]] |= 1 << bit
+        last.append(max(src[e], dst[e]))
+    return incident, last, max(m.bit_count() for m in incident)
+
+def _bitset_search(tables, n, start, remaining, uncovered, chosen, stop=None):
+    """Primer subconjunto (orden de combinations) de tamaño remaining que cubre uncovered"""
+    incident, last, max_degree = tables
+    if not uncovered:
+        return remaining == 0
+    if remaining == 0 or uncovered.bit_count() > remaining * max_degree:
+        return False
+    if stop is not None and stop():
+        return False
+    limit = last[(uncovered & -uncovered).bit_length() - 1]
+    for v in range(start, min(limit, n - remaining) + 1):
+        chosen.append(v)
+        if _bitset_search(tables, n, v + 1, remaining - 1, uncovered & ~incident[v], chosen, stop):
+            return True
+        chosen.pop()
+    return False
+
+def bitset_vertex_cover(graph):
+    """Búsqueda exhaustiva con bitsets; devuelve la misma tupla que brute_force_vertex_cover.
+
+    Recorre los subconjuntos por tamaño creciente y, dentro de cada tamaño, en
+    el orden de combinations(); el conjunto de aristas sin cubrir es un entero
+    que se actualiza con una sola operación por nodo agregado.
+    """
+    nodes, src, dst = _indexed_edges(graph)
+    n = len(nodes)
+    if not src:
+        return (nodes[0],) if nodes else None
+
+    tables = _bitset_tables(n, src, dst)
+    full = (1 << len(src)) - 1
+    for k in range(1, n + 1):
+        chosen = []
+        if _bitset_search(tables, n, 0, k, full, chosen):
+            return tuple(nodes[i] for i in chosen)
+    return None
+
+def compare_vertex_cover_methods(graph):
+    """Compara la fuerza bruta con la búsqueda por bitsets (mismo resultado)"""
+    start_brute = time.perf_counter()
+    brute_cover = brute_force_vertex_cover(graph)
+    time_brute = time.perf_counter() - start_brute
+
+    start_bitset = time.perf_counter()
+    bitset_cover = bitset_vertex_cover(graph)
+    time_bitset = time.perf_counter() - start_bitset
+
+    return brute_cover == bitset_cover, time_brute, time_bitset, bitset_cover
+
+def greedy_vertex_cover(graph):
+    """Greedy por grado máximo con cola de buckets; no modifica el grafo.
+
+    Empates: gana el primer nodo en el orden de graph.nodes, igual que max().
+    """
+    nodes, src, dst = _indexed_edges(graph)
+    neighbors = [[] for _ in nodes]
+    for u, v in zip(src, dst):
+        neighbors[u].append(v)
+        if u != v:
+            neighbors[v].append(u)
+    degree = [len(ns) for ns in neighbors]
+    edges_left = len(src)
+
+    # buckets[d]: heap de índices con grado d (entradas obsoletas se descartan al sacar)
+    buckets = [[] for _ in range(max(degree, default=0) + 1)]
+    for i, d in enumerate(degree):
+        buckets[d].append(i)
+    removed = [False] * len(nodes)
+    top = len(buckets) - 1
+
+    cover = set()
+    while edges_left > 0:
+        while True:
+            bucket = buckets[top]
+            while bucket and (removed[bucket[0]] or degree[bucket[0]] != top):
+                heapq.heappop(bucket)
+            if bucket:
+                break
+            top -= 1
+        v = heapq.heappop(bucket)
+        cover.add(nodes[v])
+        removed[v] = True
+        edges_left -= degree[v]
+        for u in neighbors[v]:
+            if not removed[u]:
+                degree[u] -= 1
+                heapq.heappush(buckets[degree[u]], u)
+    return cover
+
+# Vertex cover exacto: kernelización + árbol de búsqueda acotado
+def _copy_adj(adj):
+    return {v: set(ns) for v, ns in adj.items()}
+
+def _remove_vertex(adj, v):
+    for u in adj.pop(v):
+        adj[u].discard(v)
+
+def _lp_lower_bound(adj):
+    """Cota de la relajación lineal: techo de la mitad del emparejamiento máximo del doble bipartito.
+
+    El doble bipartito tiene una copia izquierda y una derecha de cada nodo y
+    las aristas (u, v') y (v, u'); la mitad de su emparejamiento máximo es el
+    óptimo de la relajación (un emparejamiento fraccionario máximo), que nunca
+    es menor que un emparejamiento máximo del grafo ni que aristas / grado
+    máximo. Se calcula con Hopcroft–Karp sin recursión.
+    """
+    mate_left = {}
+    mate_right = {}
+    for u in adj:
+        for v in adj[u]:
+            if v not in mate_right:
+                mate_left[u] = v
+                mate_right[v] = u
+                break
+    while True:
+        # Capas por BFS desde los nodos izquierdos libres
+        queue = [u for u in adj if u not in mate_left]
+        layer = dict.fromkeys(queue, 0)
+        found = False
+        for u in queue:
+            for v in adj[u]:
+                w = mate_right.get(v)
+                if w is None:
+                    found = True
+                elif w not in layer:
+                    layer[w] = layer[u] + 1
+                    queue.append(w)
+        if not found:
+            return (len(mate_left) + 1) // 2
+        # Caminos aumentantes disjuntos por DFS sobre las capas
+        for root in [u for u in adj if u not in mate_left]:
+            stack = [(root, iter(adj[root]))]
+            path = []
+            while stack:
+                u, neighbors = stack[-1]
+                for v in neighbors:
+                    w = mate_right.get(v)
+                    if w is None:
+                        path.append(v)
+                        for (x, _), y in zip(stack, path):
+                            mate_left[x] = y
+                            mate_right[y] = x
+                        stack = []
+                        break
+                    if layer.get(w) == layer[u] + 1:
+                        path.append(v)
+                        stack.append((w, iter(adj[w])))
+                        break
+                else:
+                    layer[u] = None  # sin salida en esta fase
+                    stack.pop()
+                    if path:
+                        path.pop()
+
+def _clique_lower_bound(adj):
+    """Cota por partición en cliques: un cover deja fuera a lo sumo un nodo de cada clique"""
+    cliques = []
+    clique_of = {}
+    # Primero los nodos de menor grado, que tienen menos cliques posibles;
+    # solo pueden recibir a v las cliques de alguno de sus vecinos
+    for v in sorted(adj, key=lambda u: len(adj[u])):
+        neighbors = adj[v]
+        for k in sorted({clique_of[u] for u in neighbors if u in clique_of}):
+            if cliques[k] <= neighbors:
+                cliques[k].add(v)
+                clique_of[v] = k
+                break
+        else:
+            clique_of[v] = len(cliques)
+            cliques.append({v})
+    return len(adj) - len(cliques)
+
+def _lower_bound(adj):
+    if not any(adj.values()):
+        return 0
+    return max(_lp_lower_bound(adj), _clique_lower_bound(adj))
+
+def _components(adj):
+    seen = set()
+    components = []
+    for start in adj:
+        if start in seen:
+            continue
+        seen.add(start)
+        stack = [start]
+        component = []
+        while stack:
+            u = stack.pop()
+            component.append(u)
+            for v in adj[u]:
+                if v not in seen:
+                    seen.add(v)
+                    stack.append(v)
+        components.append({u: adj[u] for u in component})
+    return components
+
+
+class _VertexCoverSolver:
+    """Branch-and-bound sobre grafos de enteros {nodo: set(vecinos)}.
+
+    Reducciones: grado 0/1, grado 2 (triángulo y plegado) y corona. check, si
+    se da, se llama en cada ramificación y puede lanzar una excepción para cortar
+    la búsqueda.
+    """
+
+    def __init__(self, first_free_id, check=None):
+        self._ids = count(first_free_id)
+        self._check = check
+
+    def solve(self, adj, budget=None):
+        """Devuelve un cover mínimo de tamaño <= budget, o None si no existe"""
+        if budget is None:
+            budget = len(adj)
+        return self._solve(_copy_adj(adj), budget)
+
+    def _solve(self, adj, budget):
+        forced, folds = self._kernelize(adj)
+        budget -= len(forced) + len(folds)
+        if budget < 0:
+            return None
+        if _lower_bound(adj) > budget:
+            return None
+
+        components = _components(adj)
+        if len(components) > 1:
+            cover = self._solve_components(components, budget)
+        elif components:
+            cover = self._branch(components[0], budget)
+        else:
+            cover = set()
+        if cover is None:
+            return None
+        return self._unfold(cover | forced, folds)
+
+    def _solve_components(self, components, budget):
+        bounds = [_lower_bound(c) for c in components]
+        pending = sum(bounds)
+        cover = set()
+        # Primero las componentes pequeñas: fallan rápido si no alcanza el presupuesto
+        order = sorted(range(len(components)), key=lambda i: len(components[i]))
+        for i in order:
+            pending -= bounds[i]
+            sub = self._solve(components[i], budget - len(cover) - pending)
+            if sub is None:
+                return None
+            cover |= sub
+        return cover
+
+    def _branch(self, adj, budget):
+        if self._check is not None:
+            self._check()
+        v = max(adj, key=lambda u: len(adj[u]))
+        neighbors = set(adj[v])
+        best = None
+
+        # Rama 1: v en el cover
+        if budget >= 1:
+            g = _copy_adj(adj)
+            _remove_vertex(g, v)
+            sub = self._solve(g, budget - 1)
+            if sub is not None:
+                best = sub | {v}
+                budget = len(best) - 1  # solo interesa mejorar estrictamente
+
+        # Rama 2: v fuera del cover, todos sus vecinos dentro
+        if len(neighbors) <= budget:
+            g = _copy_adj(adj)
+            for u in neighbors:
+                _remove_vertex(g, u)
+            _remove_vertex(g, v)
+            sub = self._solve(g, budget - len(neighbors))
+            if sub is not None:
+                best = sub | neighbors
+        return best
+
+    def _kernelize(self, adj):
+        """Aplica reducciones in-place; devuelve (nodos forzados, plegados)"""
+        forced = set()
+        folds = []
+        while True:
+            changed = False
+            for v in list(adj):
+                if v not in adj:
+                    continue
+                degree = len(adj[v])
+                if degree == 0:
+                    del adj[v]
+                    changed = True
+                elif degree == 1:
+                    u = next(iter(adj[v]))
+                    forced.add(u)
+                    _remove_vertex(adj, u)
+                    del adj[v]
+                    changed = True
+                elif degree == 2:
+                    u, w = adj[v]
+                    if w in adj[u]:
+                        # Triángulo: u y w siempre pueden ir al cover
+                        forced.update((u, w))
+                        _remove_vertex(adj, u)
+                        _remove_vertex(adj, w)
+                        del adj[v]
+                    else:
+                        folds.append(self._fold(adj, v, u, w))
+                    changed = True
+            if not changed:
+                crown = self._crown(adj)
+                if not crown:
+                    return forced, folds
+                forced |= crown
+
+    def _fold(self, adj, v, u, w):
+        z = next(self._ids)
+        neighbors = (adj[u] | adj[w]) - {v}
+        for x in (v, u, w):
+            _remove_vertex(adj, x)
+        adj[z] = neighbors
+        for x in neighbors:
+            adj[x].add(z)
+        return z, v, u, w
+
+    def _unfold(self, cover, folds):
+        for z, v, u, w in reversed(folds):
+            if z in cover:
+                cover.discard(z)
+                cover.update((u, w))
+            else:
+                cover.add(v)
+        return cover
+
+    def _crown(self, adj):
+        """Reducción de corona (Abu-Khzam et al.); devuelve la cabeza H"""
+        matched = set()
+        for u in adj:
+            if u in matched:
+                continue
+            for v in adj[u]:
+                if v not in matched:
+                    matched.update((u, v))
+                    break
+        outsiders = [u for u in adj if u not in matched]
+        if not outsiders:
+            return set()
+
+        # Emparejamiento máximo bipartito entre O y N(O) (caminos aumentantes)
+        partner = {}
+        def augment(u, visited):
+            for h in adj[u]:
+                if h in visited:
+                    continue
+                visited.add(h)
+                if h not in partner or augment(partner[h], visited):
+                    partner[h] = u
+                    return True
+            return False
+        for u in outsiders:
+            augment(u, set())
+        matched_outsiders = set(partner.values())
+
+        crown = {u for u in outsiders if u not in matched_outsiders}
+        if not crown:
+            return set()
+        head = set()
+        while True:
+            new_head = set()
+            for u in crown:
+                new_head |= adj[u]
+            if new_head == head:
+                break
+            head = new_head
+            crown |= {partner[h] for h in head if h in partner}
+        for h in head:
+            _remove_vertex(adj, h)
+        for u in crown:
+            adj.pop(u, None)
+        return head
+
+
+def _integer_adjacency(n, src, dst):
+    """Adyacencia {id: set(vecinos)} sin los nodos con lazo, y el conjunto de esos nodos"""
+    adj = {i: set() for i in range(n)}
+    loops = set()
+    for u, v in zip(src, dst):
+        if u == v:
+            loops.add(u)
+        else:
+            adj[u].add(v)
+            adj[v].add(u)
+    # Un nodo con lazo siempre está en el cover
+    for v in loops:
+        _remove_vertex(adj, v)
+    return adj, loops
+
+def _remaining(adj, gone):
+    """Copia de adj sin los nodos de gone"""
+    return {u: ns - gone for u, ns in adj.items() if u not in gone}
+
+def _canonical_cover(n, adj, loops, witness, test, window=1, check=None):
+    """Primera combinación (orden lexicográfico) de tamaño mínimo, como la fuerza bruta.
+
+    Se fija cada nodo en orden, incluyéndolo si todavía existe un cover óptimo
+    que lo contenga; witness es un cover óptimo cualquiera de adj. Las pruebas
+    se arman de a `window` suponiendo que las anteriores fallan, y
+    test(pruebas) recibe tuplas (nodos ya decididos, nodo, presupuesto) y
+    devuelve los resultados en orden (un cover del resto sin el nodo, o None)
+    hasta el primer cover inclusive. Lo que se calculó más allá se descarta,
+    así que el resultado no depende de `window`.
+    """
+    witness = set(witness)
+    budget = len(witness)
+    gone = set()
+    chosen = set(loops)
+    v = 0
+    while v < n:
+        if check is not None:
+            check()
+        # Recorrido simulado: mientras no haya pruebas, las decisiones son definitivas
+        tasks, before = [], []
+        state_gone, state_chosen, state_budget = set(gone), set(chosen), budget
+        while v < n and len(tasks) < window:
+            neighbors = () if v in state_gone else [u for u in adj.get(v, ()) if u not in state_gone]
+            if not neighbors:
+                state_gone.add(v)
+            elif v in witness:
+                state_chosen.add(v)
+                state_gone.add(v)
+                state_budget -= 1
+            else:
+                tasks.append((frozenset(state_gone), v, state_budget - 1))
+                before.append((set(state_gone), set(state_chosen), state_budget))
+                # Si la prueba falla, v queda fuera y sus vecinos dentro
+                state_chosen.update(neighbors)
+                state_gone.update(neighbors)
+                state_gone.add(v)
+                state_budget -= len(neighbors)
+            v += 1
+        gone, chosen, budget = state_gone, state_chosen, state_budget
+        if not tasks:
+            break
+        for (_, u, _), cover, state in zip(tasks, test(tasks), before):
+            if cover is not None:
+                gone, chosen, budget = state
+                witness = cover | {u}
+                chosen.add(u)
+                gone.add(u)
+                budget -= 1
+                v = u + 1
+                break
+    return sorted(chosen)
+
+
+def exact_vertex_cover(graph, check=None):
+    """Vertex cover mínimo exacto; devuelve la misma tupla que brute_force_vertex_cover.
+
+    check es una función opcional que se llama periódicamente durante la
+    búsqueda; si lanza una excepción, la búsqueda se interrumpe con ella.
+    """
+    nodes, src, dst = _indexed_edges(graph)
+    if not src:
+        # Igual que la fuerza bruta: con k=1 cualquier nodo "cubre" un grafo sin aristas
+        return (nodes[0],) if nodes else None
+
+    adj, loops = _integer_adjacency(len(nodes), src, dst)
+    solver = _VertexCoverSolver(len(nodes), check)
+    witness = solver.solve(adj)
+
+    def test(tasks):
+        gone, v, budget = tasks[0]
+        return [solver.solve(_remaining(adj, gone | {v}), budget)]
+
+    return tuple(nodes[i] for i in _canonical_cover(len(nodes), adj, loops, witness, test, check=check))
+
+
+# Branch-and-bound en paralelo: el árbol de búsqueda se parte ramificando en
+# los primeros nodos de mayor grado (v dentro del cover, o todos sus vecinos
+# dentro) y cada hoja de ese prefijo es una tarea. Las aristas se comparten en
+# memoria compartida de solo lectura y "best" guarda el tamaño del mejor cover
+# encontrado: una tarea busca solo covers estrictamente menores y, si otra
+# mejora la cota mientras corre, vuelve a empezar con la cota nueva. El cover
+# devuelto se elige después en orden lexicográfico con _canonical_cover, cuyas
+# pruebas corren en el mismo pool, así que no depende del número de procesos.
+_worker = {}
+
+
+class _BoundTightened(Exception):
+    """Otra tarea encontró un cover mejor: hay que reiniciar con la cota nueva"""
+
+
+class _StaleTest(Exception):
+    """La ventana de la prueba ya se resolvió o se canceló: su resultado no sirve"""
+
+
+def _branch_prefixes(adj, depth):
+    """Decisiones ((nodo, dentro), ...) de cada hoja al ramificar en los `depth` nodos de mayor grado"""
+    order = sorted(adj, key=lambda u: (-len(adj[u]), u))[:depth]
+    prefixes = []
+    stack = [(0, adj, ())]
+    while stack:
+        i, g, path = stack.pop()
+        while i < len(order) and not g.get(order[i]):
+            i += 1  # el nodo ya salió del grafo o quedó aislado: no hay que decidir
+        if i == len(order):
+            prefixes.append(path)
+            continue
+        v = order[i]
+        take = _copy_adj(g)
+        _remove_vertex(take, v)
+        leave = _copy_adj(g)
+        for u in g[v]:
+            _remove_vertex(leave, u)
+        _remove_vertex(leave, v)
+        # Se apila primero la rama "fuera" para que las hojas queden en orden de búsqueda
+        stack.append((i + 1, leave, path + ((v, False),)))
+        stack.append((i + 1, take, path + ((v, True),)))
+    return prefixes
+
+def _init_cover_worker(shm_name, n, m, best, window):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    edges = np.ndarray((2, m), dtype=np.int64, buffer=shm.buf)
+    _worker['adj'], _ = _integer_adjacency(n, edges[0].tolist(), edges[1].tolist())
+    _worker['n'] = n
+    _worker['best'] = best
+    _worker['window'] = window
+    del edges
+    shm.close()
+
+def _apply_prefix(g, path):
+    """Aplica en g las decisiones de un prefijo de _branch_prefixes; devuelve los nodos que quedan en el cover"""
+    forced = set()
+    for v, inside in path:
+        chosen = {v} if inside else set(g[v])
+        forced |= chosen
+        for u in chosen:
+            _remove_vertex(g, u)
+        g.pop(v, None)
+    return forced
+
+def _solve_prefix(path):
+    """Mejor cover del subárbol de `path` estrictamente menor que la cota global, o None"""
+    best = _worker['best']
+    g = _copy_adj(_worker['adj'])
+    forced = _apply_prefix(g, path)
+
+    while True:
+        bound = best.value
+        def check():
+            if best.value < bound:
+                raise _BoundTightened()
+        budget = bound - 1 - len(forced)
+        if budget < 0:
+            return None
+        try:
+            cover = _VertexCoverSolver(_worker['n'], check).solve(g, budget)
+        except _BoundTightened:
+            continue
+        if cover is None:
+            return None
+        cover |= forced
+        with best.get_lock():
+            if len(cover) < best.value:
+                best.value = len(cover)
+        return cover
+
+def _test_vertex(task, path, window_id):
+    """Una parte (prefijo `path`) de una prueba de _canonical_cover: cover del resto sin el nodo, o None"""
+    gone, v, budget = task
+    window = _worker['window']
+    def check():
+        if window.value != window_id:
+            raise _StaleTest()
+    g = _remaining(_worker['adj'], gone | {v})
+    forced = _apply_prefix(g, path)
+    if budget < len(forced):
+        return None
+    try:
+        cover = _VertexCoverSolver(_worker['n'], check).solve(g, budget - len(forced))
+    except _StaleTest:
+        return None
+    return None if cover is None else cover | forced
+
+def parallel_vertex_cover(graph, workers=None, depth=None, check=None, min_nodes=40):
+    """exact_vertex_cover con el árbol de búsqueda repartido en un pool de procesos.
+
+    Devuelve la misma tupla que exact_vertex_cover con cualquier número de
+    workers. depth es cuántos nodos se ramifican para armar las tareas (por
+    defecto, lo justo para unas 4 tareas por proceso). La elección del cover
+    lexicográfico prueba `workers` nodos a la vez en el mismo pool. check se
+    llama mientras se esperan resultados; si lanza una excepción, las tareas se
+    cortan y la excepción se propaga. Grafos con menos de min_nodes nodos se
+    resuelven sin pool.
+    """
+    nodes, src, dst = _indexed_edges(graph)
+    n = len(nodes)
+    workers = workers or os.cpu_count() or 1
+    if not src or workers == 1 or n < min_nodes:
+        return exact_vertex_cover(graph, check)
+
+    adj, loops = _integer_adjacency(n, src, dst)
+    index = {node: i for i, node in enumerate(nodes)}
+    witness = {index[node] for node in greedy_vertex_cover(graph)} - loops
+    if depth is None:
+        depth = max(1, (4 * workers - 1).bit_length())
+    prefixes = _branch_prefixes(adj, depth)
+
+    m = len(src)
+    context = multiprocessing.get_context("spawn")
+    shm = shared_memory.SharedMemory(create=True, size=max(2 * m * 8, 1))
+    try:
+        edges = np.ndarray((2, m), dtype=np.int64, buffer=shm.buf)
+        edges[0] = src
+        edges[1] = dst
+        del edges
+        best = context.Value('q', len(witness))
+        window = context.Value('q', 0)  # ventana de pruebas vigente
+        split = max(1, (workers - 1).bit_length())  # unos `workers` prefijos por prueba
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_cover_worker,
+                                 initargs=(shm.name, n, m, best, window)) as pool:
+            def test(tasks):
+                # Cada prueba se parte en prefijos como la búsqueda; el pool las
+                # atiende en orden, así que las especulativas usan lo que sobra
+                current = window.value
+                parts = []
+                for task in tasks:
+                    gone, v, _ = task
+                    paths = _branch_prefixes(_remaining(adj, gone | {v}), split)
+                    parts.append([pool.submit(_test_vertex, task, path, current) for path in paths])
+                results = []
+                for futures in parts:
+                    found, pending = None, set(futures)
+                    while pending and found is None:
+                        done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                        found = next((c for c in (f.result() for f in done) if c is not None), None)
+                        if check is not None:
+                            check()
+                    results.append(found)
+                    if found is not None:
+                        break
+                window.value += 1  # las pruebas que sigan corriendo se cortan
+                for futures in parts:
+                    for future in futures:
+                        future.cancel()
+                return results
+
+            try:
+                pending = {pool.submit(_solve_prefix, path) for path in prefixes}
+                while pending:
+                    done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        cover = future.result()
+                        if cover is not None and len(cover) < len(witness):
+                            witness = cover
+                    if check is not None:
+                        check()
+                chosen = _canonical_cover(n, adj, loops, witness, test, window=workers, check=check)
+            except BaseException:
+                # Las tareas en curso ven budget < 0 o una ventana vieja y terminan
+                best.value = -1
+                window.value = -1
+                pool.shutdown(cancel_futures=True)
+                raise
+    finally:
+        shm.close()
+        shm.unlink()
+    return tuple(nodes[i] for i in chosen)